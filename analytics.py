@@ -2,59 +2,251 @@
 Analytics and reporting functions for JustEat application
 """
 
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta
+from decimal import Decimal
+from time import sleep
 from flask import current_app
-from sqlalchemy import func, desc
+from cache import cache_analytics_data
+from models import (db, User, Restaurant, MenuItem, Order, OrderItem,
+                    Review, RestaurantDailyStat, MenuItemDailyStat)
+from sqlalchemy import func, desc, case, insert, select, bindparam, lambda_stmt
+import json
 import logging
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """Stdlib json fallback mirroring how orjson renders these types"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(
+        f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def rows_to_json_response(rows):
+    """Serialize (date, revenue, order_count) row tuples straight to JSON bytes
+
+    With orjson installed the rows go to bytes at C speed (date is handled
+    natively, Decimal through default=float) without per-field str()/float()
+    conversion or the jsonify roundtrip; otherwise falls back to the stdlib
+    encoder with a default that matches orjson's output (Decimal -> number,
+    date -> ISO string) so the payload types do not depend on which encoder
+    is installed.
+    """
+    payload = [
+        {'date': row[0], 'revenue': row[1], 'order_count': row[2]}
+        for row in rows
+    ]
+    if orjson is not None:
+        body = orjson.dumps(payload, default=float)
+    else:
+        body = json.dumps(payload, default=_json_default).encode()
+    return current_app.response_class(body, mimetype='application/json')
+
+
+def _date_range_bounds(days):
+    """Half-open [start, end) datetime bounds covering the last `days` days.
+
+    Comparing created_at directly against datetimes (instead of wrapping it
+    in func.date) keeps the predicate sargable so the column index is usable.
+    """
+    end_date = date.today()
+    start_date = end_date - timedelta(days=days)
+    return (datetime.combine(start_date, time.min),
+            datetime.combine(end_date + timedelta(days=1), time.min))
+
+
+def refresh_restaurant_daily_stats():
+    """Rebuild the mv_restaurant_daily_stats summary table
+
+    MySQL has no REFRESH MATERIALIZED VIEW, so the summary is a plain table
+    repopulated with a single DELETE + INSERT ... SELECT transaction. Meant
+    to run from an hourly scheduler (see start_daily_stats_refresher).
+    """
+    buckets = db.session.query(
+        Order.restaurant_id,
+        func.date(Order.created_at).label('day'),
+        func.hour(Order.created_at).label('hour'),
+        Order.status,
+        func.sum(Order.total_amount).label('revenue'),
+        func.count(Order.id).label('order_count')
+    ).group_by(
+        Order.restaurant_id,
+        func.date(Order.created_at),
+        func.hour(Order.created_at),
+        Order.status
+    )
+
+    db.session.query(RestaurantDailyStat).delete()
+    db.session.execute(insert(RestaurantDailyStat).from_select(
+        ['restaurant_id', 'day', 'hour', 'status', 'revenue', 'order_count'],
+        buckets
+    ))
+    db.session.commit()
+    logger.info("Refreshed mv_restaurant_daily_stats")
+
+
+def refresh_menu_item_daily_stats():
+    """Rebuild the mv_menu_item_daily_stats summary table
+
+    Same DELETE + INSERT ... SELECT rebuild as the restaurant summary:
+    one grouped pass over order_items replaces the two aggregations the
+    MenuItem daily properties would otherwise run per item per render.
+    """
+    buckets = db.session.query(
+        OrderItem.menu_item_id,
+        func.date(Order.created_at).label('order_date'),
+        func.sum(OrderItem.quantity).label('total_qty'),
+        func.max(OrderItem.quantity).label('max_single_qty')
+    ).join(Order, Order.id == OrderItem.order_id).group_by(
+        OrderItem.menu_item_id,
+        func.date(Order.created_at)
+    )
+
+    db.session.query(MenuItemDailyStat).delete()
+    db.session.execute(insert(MenuItemDailyStat).from_select(
+        ['menu_item_id', 'order_date', 'total_qty', 'max_single_qty'],
+        buckets
+    ))
+    db.session.commit()
+    logger.info("Refreshed mv_menu_item_daily_stats")
+
+
+def settle_restaurant_rolling_stats():
+    """Recompute the rolling 30-day columns on restaurants
+
+    The write-time listeners only ever add to the window; this settlement
+    pass recomputes each column from the base tables so orders and reviews
+    that aged out of the 30-day window drop back off.
+    """
+    start_dt, end_dt = _date_range_bounds(30)
+
+    order_count = select(func.count(Order.id)).where(
+        Order.restaurant_id == Restaurant.id,
+        Order.created_at >= start_dt,
+        Order.created_at < end_dt).scalar_subquery()
+    revenue = select(func.coalesce(func.sum(Order.total_amount), 0)).where(
+        Order.restaurant_id == Restaurant.id,
+        Order.created_at >= start_dt,
+        Order.created_at < end_dt).scalar_subquery()
+    review_count = select(func.count(Review.id)).where(
+        Review.restaurant_id == Restaurant.id,
+        Review.created_at >= start_dt,
+        Review.created_at < end_dt).scalar_subquery()
+    avg_rating = select(func.coalesce(func.avg(Review.rating), 0)).where(
+        Review.restaurant_id == Restaurant.id,
+        Review.created_at >= start_dt,
+        Review.created_at < end_dt).scalar_subquery()
+
+    db.session.execute(Restaurant.__table__.update().values(
+        orders_30d=order_count,
+        revenue_30d=revenue,
+        reviews_30d=review_count,
+        avg_rating_30d=avg_rating))
+    db.session.commit()
+    logger.info("Settled restaurant rolling stats")
+
+
+def start_daily_stats_refresher(app, interval_seconds=3600):
+    """Refresh the daily stats summary and settle rolling stats periodically"""
+    def _refresh_loop():
+        # Work first, then sleep: the rolling columns arrive at their
+        # migration default of 0, so waiting a full interval before the
+        # first settle would leave every dashboard showing zeros for up
+        # to an hour (two, once the report cache is counted) after a
+        # deploy
+        while True:
+            with app.app_context():
+                try:
+                    refresh_restaurant_daily_stats()
+                    refresh_menu_item_daily_stats()
+                    settle_restaurant_rolling_stats()
+                except Exception:
+                    logger.error("Daily stats refresh failed", exc_info=True)
+            sleep(interval_seconds)
+
+    refresher = threading.Thread(
+        target=_refresh_loop, daemon=True, name='daily-stats-refresher')
+    refresher.start()
+    return refresher
+
+
+def _ensure_daily_stats():
+    """Populate the summary table on first read if it was never refreshed"""
+    if db.session.query(RestaurantDailyStat.id).first() is None:
+        refresh_restaurant_daily_stats()
+
+
 class Analytics:
     """Analytics class for generating reports and insights"""
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_restaurant_performance(restaurant_id, days=30):
         """Get performance metrics for a restaurant"""
-        from models import Order, Review, MenuItem, OrderItem
-
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
-
-        # Total orders
-        total_orders = Order.query.filter(
-            Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).count()
-
-        # Total revenue
-        total_revenue = current_app.db.session.query(
-            func.sum(Order.total_amount)
-        ).filter(
-            Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).scalar() or 0
+        # The default 30-day window is pre-aggregated on the restaurant row
+        # (maintained at write time, settled by the background refresher)
+        if days == 30:
+            row = db.session.query(
+                Restaurant.orders_30d,
+                Restaurant.revenue_30d,
+                Restaurant.reviews_30d,
+                Restaurant.avg_rating_30d
+            ).filter(Restaurant.id == restaurant_id).one_or_none()
+            if row is not None:
+                total_orders, total_revenue, total_reviews, avg_rating = row
+                return {
+                    'total_orders': total_orders,
+                    'total_revenue': float(total_revenue),
+                    'avg_order_value': float(
+                        total_revenue / total_orders) if total_orders > 0 else 0,
+                    'total_reviews': total_reviews,
+                    'avg_rating': round(float(avg_rating), 1),
+                    'period_days': days
+                }
+
+        start_dt, end_dt = _date_range_bounds(days)
+
+        # Orders metrics in a single round-trip; lambda_stmt caches the
+        # compiled SQL across calls since only bind values change
+        orders_stmt = lambda_stmt(lambda: select(
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.total_amount), 0)
+        ).where(
+            Order.restaurant_id == bindparam('rid'),
+            Order.created_at >= bindparam('start'),
+            Order.created_at < bindparam('end')
+        ))
+        total_orders, total_revenue = db.session.execute(
+            orders_stmt,
+            {'rid': restaurant_id, 'start': start_dt, 'end': end_dt}
+        ).one()
 
         # Average order value
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
 
-        # Total reviews
-        total_reviews = Review.query.filter(
-            Review.restaurant_id == restaurant_id,
-            func.date(Review.created_at) >= start_date,
-            func.date(Review.created_at) <= end_date
-        ).count()
-
-        # Average rating
-        avg_rating = current_app.db.session.query(
-            func.avg(Review.rating)
-        ).filter(
-            Review.restaurant_id == restaurant_id,
-            func.date(Review.created_at) >= start_date,
-            func.date(Review.created_at) <= end_date
-        ).scalar() or 0
+        # Reviews metrics in a single round-trip
+        reviews_stmt = lambda_stmt(lambda: select(
+            func.count(Review.id),
+            func.coalesce(func.avg(Review.rating), 0)
+        ).where(
+            Review.restaurant_id == bindparam('rid'),
+            Review.created_at >= bindparam('start'),
+            Review.created_at < bindparam('end')
+        ))
+        total_reviews, avg_rating = db.session.execute(
+            reviews_stmt,
+            {'rid': restaurant_id, 'start': start_dt, 'end': end_dt}
+        ).one()
 
         return {
             'total_orders': total_orders,
@@ -66,22 +258,20 @@ class Analytics:
         }
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_popular_menu_items(restaurant_id, days=7, limit=10):
         """Get most popular menu items for a restaurant"""
-        from models import MenuItem, OrderItem, Order
-
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
+        start_dt, end_dt = _date_range_bounds(days)
 
-        popular_items = current_app.db.session.query(
+        popular_items = db.session.query(
             MenuItem,
             func.count(OrderItem.id).label('order_count'),
             func.sum(OrderItem.quantity).label('total_quantity'),
             func.sum(OrderItem.price * OrderItem.quantity).label('total_revenue')
         ).join(OrderItem).join(Order).filter(
             MenuItem.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
+            Order.created_at >= start_dt,
+            Order.created_at < end_dt
         ).group_by(MenuItem.id).order_by(
             desc('order_count')
         ).limit(limit).all()
@@ -97,96 +287,93 @@ class Analytics:
         ]
 
     @staticmethod
-    def get_daily_revenue(restaurant_id, days=30):
-        """Get daily revenue for a restaurant"""
-        from models import Order
-
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
-
-        daily_revenue = current_app.db.session.query(
-            func.date(Order.created_at).label('date'),
-            func.sum(Order.total_amount).label('revenue'),
-            func.count(Order.id).label('order_count')
+    @cache_analytics_data(3600)
+    def get_daily_revenue_rows(restaurant_id, days=30):
+        """Get daily revenue rows for a restaurant as raw tuples
+
+        Returned untouched (no per-row dict building) so callers that only
+        serialize them — see /api daily-revenue — can hand them straight to
+        rows_to_json_response.
+        """
+        start_dt, end_dt = _date_range_bounds(days)
+        _ensure_daily_stats()
+
+        return db.session.query(
+            RestaurantDailyStat.day.label('date'),
+            func.sum(RestaurantDailyStat.revenue).label('revenue'),
+            func.sum(RestaurantDailyStat.order_count).label('order_count')
         ).filter(
-            Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
+            RestaurantDailyStat.restaurant_id == restaurant_id,
+            RestaurantDailyStat.day >= start_dt.date(),
+            RestaurantDailyStat.day < end_dt.date()
         ).group_by(
-            func.date(Order.created_at)
+            RestaurantDailyStat.day
         ).order_by(
-            func.date(Order.created_at)
+            RestaurantDailyStat.day
         ).all()
 
+    @staticmethod
+    def get_daily_revenue(restaurant_id, days=30):
+        """Get daily revenue for a restaurant (served from the daily stats summary)"""
         return [
             {
                 'date': str(day[0]),
                 'revenue': float(day[1]),
                 'order_count': day[2]
             }
-            for day in daily_revenue
+            for day in Analytics.get_daily_revenue_rows(restaurant_id, days)
         ]
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_customer_insights(restaurant_id, days=30):
         """Get customer insights for a restaurant"""
-        from models import Order, User
+        start_dt, end_dt = _date_range_bounds(days)
 
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
-
-        # New customers
-        new_customers = current_app.db.session.query(User).join(Order).filter(
-            Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).distinct().count()
-
-        # Returning customers
-        returning_customers = current_app.db.session.query(
-            Order.customer_id,
+        # Per-customer order counts, aggregated once and read in one round-trip
+        per_customer = db.session.query(
+            Order.customer_id.label('customer_id'),
             func.count(Order.id).label('order_count')
         ).filter(
             Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).group_by(Order.customer_id).having(
-            func.count(Order.id) > 1
-        ).count()
-
-        # Average orders per customer
-        total_orders = Order.query.filter(
-            Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).count()
+            Order.created_at >= start_dt,
+            Order.created_at < end_dt
+        ).group_by(Order.customer_id).subquery()
+
+        total_customers, returning_customers, total_orders = db.session.query(
+            func.count(per_customer.c.customer_id),
+            func.coalesce(
+                func.sum(
+                    case((per_customer.c.order_count > 1, 1), else_=0)
+                ), 0),
+            func.coalesce(func.sum(per_customer.c.order_count), 0)
+        ).one()
 
         avg_orders_per_customer = total_orders / \
-            new_customers if new_customers > 0 else 0
+            total_customers if total_customers > 0 else 0
 
         return {
-            'new_customers': new_customers,
+            'new_customers': total_customers - returning_customers,
             'returning_customers': returning_customers,
-            'total_customers': new_customers + returning_customers,
+            'total_customers': total_customers,
             'avg_orders_per_customer': round(avg_orders_per_customer, 2)
         }
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_order_status_distribution(restaurant_id, days=30):
-        """Get distribution of order statuses"""
-        from models import Order
-
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
+        """Get distribution of order statuses (served from the daily stats summary)"""
+        start_dt, end_dt = _date_range_bounds(days)
+        _ensure_daily_stats()
 
-        status_distribution = current_app.db.session.query(
-            Order.status,
-            func.count(Order.id).label('count')
+        status_distribution = db.session.query(
+            RestaurantDailyStat.status,
+            func.sum(RestaurantDailyStat.order_count).label('count')
         ).filter(
-            Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).group_by(Order.status).all()
+            RestaurantDailyStat.restaurant_id == restaurant_id,
+            RestaurantDailyStat.day >= start_dt.date(),
+            RestaurantDailyStat.day < end_dt.date()
+        ).group_by(RestaurantDailyStat.status).all()
 
         return {
             status[0]: status[1]
@@ -194,22 +381,21 @@ class Analytics:
         }
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_peak_hours(restaurant_id, days=30):
-        """Get peak ordering hours"""
-        from models import Order
+        """Get peak ordering hours (served from the daily stats summary)"""
+        start_dt, end_dt = _date_range_bounds(days)
+        _ensure_daily_stats()
 
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
-
-        peak_hours = current_app.db.session.query(
-            func.hour(Order.created_at).label('hour'),
-            func.count(Order.id).label('order_count')
+        peak_hours = db.session.query(
+            RestaurantDailyStat.hour,
+            func.sum(RestaurantDailyStat.order_count).label('order_count')
         ).filter(
-            Order.restaurant_id == restaurant_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
+            RestaurantDailyStat.restaurant_id == restaurant_id,
+            RestaurantDailyStat.day >= start_dt.date(),
+            RestaurantDailyStat.day < end_dt.date()
         ).group_by(
-            func.hour(Order.created_at)
+            RestaurantDailyStat.hour
         ).order_by(
             desc('order_count')
         ).limit(5).all()
@@ -223,28 +409,26 @@ class Analytics:
         ]
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_review_insights(restaurant_id, days=30):
         """Get review insights for a restaurant"""
-        from models import Review
-
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
+        start_dt, end_dt = _date_range_bounds(days)
 
         # Rating distribution
-        rating_distribution = current_app.db.session.query(
+        rating_distribution = db.session.query(
             Review.rating,
             func.count(Review.id).label('count')
         ).filter(
             Review.restaurant_id == restaurant_id,
-            func.date(Review.created_at) >= start_date,
-            func.date(Review.created_at) <= end_date
+            Review.created_at >= start_dt,
+            Review.created_at < end_dt
         ).group_by(Review.rating).all()
 
         # Recent reviews
         recent_reviews = Review.query.filter(
             Review.restaurant_id == restaurant_id,
-            func.date(Review.created_at) >= start_date,
-            func.date(Review.created_at) <= end_date
+            Review.created_at >= start_dt,
+            Review.created_at < end_dt
         ).order_by(desc(Review.created_at)).limit(10).all()
 
         return {
@@ -256,26 +440,22 @@ class Analytics:
         }
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_platform_analytics(days=30):
         """Get platform-wide analytics"""
-        from models import Order, Restaurant, User, Review
-
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
-
-        # Total orders
-        total_orders = Order.query.filter(
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).count()
-
-        # Total revenue
-        total_revenue = current_app.db.session.query(
-            func.sum(Order.total_amount)
-        ).filter(
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).scalar() or 0
+        start_dt, end_dt = _date_range_bounds(days)
+
+        # Orders metrics in a single round-trip, with the compiled SQL cached
+        platform_stmt = lambda_stmt(lambda: select(
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.total_amount), 0)
+        ).where(
+            Order.created_at >= bindparam('start'),
+            Order.created_at < bindparam('end')
+        ))
+        total_orders, total_revenue = db.session.execute(
+            platform_stmt, {'start': start_dt, 'end': end_dt}
+        ).one()
 
         # Active restaurants
         active_restaurants = Restaurant.query.filter_by(is_active=True).count()
@@ -285,8 +465,8 @@ class Analytics:
 
         # Total reviews
         total_reviews = Review.query.filter(
-            func.date(Review.created_at) >= start_date,
-            func.date(Review.created_at) <= end_date
+            Review.created_at >= start_dt,
+            Review.created_at < end_dt
         ).count()
 
         return {
@@ -300,40 +480,41 @@ class Analytics:
                 total_orders) if total_orders > 0 else 0}
 
     @staticmethod
+    @cache_analytics_data(3600)
     def get_customer_behavior(user_id, days=30):
         """Get customer behavior insights"""
-        from models import Order, Restaurant, Review
+        start_dt, end_dt = _date_range_bounds(days)
 
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days)
-
-        # Order history
-        orders = Order.query.filter(
+        # Order totals as two scalars instead of fetching every row
+        total_orders, total_spent = db.session.query(
+            func.count(Order.id),
+            func.coalesce(func.sum(Order.total_amount), 0)
+        ).filter(
             Order.customer_id == user_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).all()
+            Order.created_at >= start_dt,
+            Order.created_at < end_dt
+        ).one()
 
-        # Favorite cuisines
-        favorite_cuisines = current_app.db.session.query(
-            Restaurant.cuisine_type,
+        # Favorite cuisines (denormalized snapshot, no join to restaurants)
+        favorite_cuisines = db.session.query(
+            Order.cuisine_type_snapshot,
             func.count(Order.id).label('order_count')
-        ).join(Order).filter(
+        ).filter(
             Order.customer_id == user_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
-        ).group_by(Restaurant.cuisine_type).order_by(
+            Order.created_at >= start_dt,
+            Order.created_at < end_dt
+        ).group_by(Order.cuisine_type_snapshot).order_by(
             desc('order_count')
         ).limit(5).all()
 
         # Favorite restaurants
-        favorite_restaurants = current_app.db.session.query(
+        favorite_restaurants = db.session.query(
             Restaurant,
             func.count(Order.id).label('order_count')
         ).join(Order).filter(
             Order.customer_id == user_id,
-            func.date(Order.created_at) >= start_date,
-            func.date(Order.created_at) <= end_date
+            Order.created_at >= start_dt,
+            Order.created_at < end_dt
         ).group_by(Restaurant.id).order_by(
             desc('order_count')
         ).limit(5).all()
@@ -341,13 +522,13 @@ class Analytics:
         # Review activity
         reviews = Review.query.filter(
             Review.user_id == user_id,
-            func.date(Review.created_at) >= start_date,
-            func.date(Review.created_at) <= end_date
+            Review.created_at >= start_dt,
+            Review.created_at < end_dt
         ).count()
 
         return {
-            'total_orders': len(orders),
-            'total_spent': sum(order.total_amount for order in orders),
+            'total_orders': total_orders,
+            'total_spent': float(total_spent),
             'favorite_cuisines': [
                 {'cuisine': cuisine[0], 'order_count': cuisine[1]}
                 for cuisine in favorite_cuisines
@@ -357,5 +538,5 @@ class Analytics:
                 for restaurant in favorite_restaurants
             ],
             'reviews_written': reviews,
-            'avg_order_value': sum(order.total_amount for order in orders) / len(orders) if orders else 0
+            'avg_order_value': float(total_spent) / total_orders if total_orders > 0 else 0
         }
@@ -3,10 +3,21 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func
+from constants import (ORDER_STATUS_LABELS, FEEDBACK_STATUS_LABELS,
+                       PRICE_FILTER_RANGES)
 from datetime import datetime, date
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import os
-import pytz   # added for timezone conversion
+import queue
+from zoneinfo import ZoneInfo   # for timezone conversion
+
+# Hoisted to module scope so the Jinja filter does not rebuild zone objects
+# on every invocation inside template render loops
+IST = ZoneInfo("Asia/Kolkata")
+UTC = ZoneInfo("UTC")
+IST_DATETIME_FORMAT = "%d/%m/%Y %I:%M %p"
 
 # Configure logging
 log_file = os.path.join(os.path.dirname(__file__), "app.log")
@@ -26,19 +37,70 @@ formatter = logging.Formatter(
 file_handler.setFormatter(formatter)
 console_handler.setFormatter(formatter)
 
+# Route records through a queue so request threads only enqueue; a single
+# background listener thread drains to the file/console handlers
+log_queue = queue.Queue(-1)
+queue_handler = QueueHandler(log_queue)
+log_listener = QueueListener(
+    log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+
 # Get root logger and attach handlers
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.INFO)
 
 if not root_logger.handlers:
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(queue_handler)
 
 # Use module-level logger for this file
 logger = logging.getLogger(__name__)
 logger.info(" Logging initialized. Writing to app.log")
 
 
+class WindowPagination:
+    """Minimal stand-in for Flask-SQLAlchemy's Pagination object
+
+    Built from a single COUNT(*) OVER () query so the page rows and the
+    total arrive in one round-trip instead of paginate()'s extra COUNT query.
+    Implements just the attributes the templates use.
+    """
+
+    def __init__(self, items, total, page, per_page):
+        self.items = items
+        self.total = total
+        self.page = page
+        self.per_page = per_page
+        self.pages = -(-total // per_page) if total else 0
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def has_next(self):
+        return self.page < self.pages
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+    def iter_pages(self, left_edge=2, left_current=2,
+                   right_current=4, right_edge=2):
+        last = 0
+        for num in range(1, self.pages + 1):
+            if (num <= left_edge
+                    or self.page - left_current <= num <= self.page + right_current
+                    or num > self.pages - right_edge):
+                if last + 1 != num:
+                    yield None
+                yield num
+                last = num
+
+
 # Flask Application Factory
 
 def create_app(config_name='default'):
@@ -60,6 +122,14 @@ def create_app(config_name='default'):
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
 
+    # Catch N+1 query regressions automatically in development
+    if app.debug:
+        try:
+            from nplusone.ext.flask_sqlalchemy import NPlusOne
+            NPlusOne(app)
+        except ImportError:
+            pass
+
     @login_manager.user_loader
     def load_user(user_id):
         from models import User
@@ -69,13 +139,28 @@ def create_app(config_name='default'):
     def format_datetime_ist(value):
         if value is None:
             return ""
-        ist = pytz.timezone("Asia/Kolkata")
         if value.tzinfo is None:  # assume UTC if naive
-            value = pytz.utc.localize(value)
-        return value.astimezone(ist).strftime("%d/%m/%Y %I:%M %p")
+            value = value.replace(tzinfo=UTC)
+        return value.astimezone(IST).strftime(IST_DATETIME_FORMAT)
 
     app.jinja_env.filters["datetime_ist"] = format_datetime_ist
 
+    # O(1) status -> label lookup shared by order and feedback badges
+    def format_status_label(status):
+        return ORDER_STATUS_LABELS.get(
+            status) or FEEDBACK_STATUS_LABELS.get(status) or status.title()
+
+    app.jinja_env.filters["status_label"] = format_status_label
+
+    # Persist compiled Jinja bytecode on disk so each worker spawn (and
+    # each deploy of unchanged templates) loads .cache files instead of
+    # recompiling every template from source. Outside debug the env also
+    # stops re-checking template mtimes per render.
+    import jinja2
+    app.jinja_env.bytecode_cache = jinja2.FileSystemBytecodeCache()
+    if not app.debug:
+        app.jinja_env.auto_reload = False
+
     # Import models and blueprints after db initialization
     from models import User, Restaurant, MenuItem, Order, OrderItem, Cart, Review, Feedback
     from routes.auth import auth_bp
@@ -109,10 +194,13 @@ def create_app(config_name='default'):
     # Initialize advanced features
     try:
         from monitoring import init_performance_monitoring
-        from cache import configure_cache
+        from cache import configure_cache, start_cache_warmer
         from notifications import notification_service
+        from analytics import start_daily_stats_refresher
         init_performance_monitoring(app)
         configure_cache(use_redis=app.config.get('USE_REDIS', False))
+        start_cache_warmer(app)
+        start_daily_stats_refresher(app)
     except ImportError:
         logger.warning("Optional advanced features not loaded.")
 
@@ -171,26 +259,28 @@ def create_app(config_name='default'):
         if location_search:
             query = query.filter(Restaurant.city.contains(location_search))
 
-        restaurants = query.paginate(page=page, per_page=9, error_out=False)
-
-        # Price filter logic
-        if price_filter:
-            filtered_restaurants = []
-            for restaurant in restaurants.items:
-                has_items_in_range = any(
-                    (price_filter == "0-200" and 0 <= float(item.price) <= 200) or
-                    (price_filter == "201-500" and 201 <= float(item.price) <= 500) or
-                    (price_filter == "501-1000" and 501 <= float(item.price) <= 1000) or
-                    (price_filter == "1001-1500" and 1001 <= float(item.price) <= 1500) or
-                    (price_filter == "1501+" and float(item.price) >= 1501)
-                    for item in restaurant.menu_items
-                )
-                if has_items_in_range:
-                    filtered_restaurants.append(restaurant)
-
-            restaurants.items = filtered_restaurants
-            restaurants.total = len(filtered_restaurants)
-
+        # Price filter as an EXISTS semi-join so pagination counts stay
+        # correct and no per-restaurant menu loads happen
+        if price_filter in PRICE_FILTER_RANGES:
+            low, high = PRICE_FILTER_RANGES[price_filter]
+            items_in_range = MenuItem.query.filter(
+                MenuItem.restaurant_id == Restaurant.id,
+                MenuItem.price >= low if high is None
+                else MenuItem.price.between(low, high)
+            )
+            query = query.filter(items_in_range.exists())
+
+        # Page rows + total in one scan via a window COUNT instead of
+        # paginate()'s separate COUNT(*) round-trip
+        per_page = 9
+        rows = query.add_columns(
+            func.count().over().label('total_count')
+        ).limit(per_page).offset((page - 1) * per_page).all()
+        total = rows[0][1] if rows else 0
+        restaurants = WindowPagination(
+            [row[0] for row in rows], total, page, per_page)
+
+        from cache import get_cities, get_cuisines
         return render_template(
             'restaurants.html',
             restaurants=restaurants,
@@ -198,7 +288,11 @@ def create_app(config_name='default'):
             cuisine_filter=cuisine_filter,
             location_filter=location_filter,
             location_search=location_search,
-            price_filter=price_filter
+            price_filter=price_filter,
+            # Cached reference lists drive the filter dropdowns, so
+            # they track the actual data instead of a hardcoded set
+            cuisines=get_cuisines(),
+            cities=get_cities()
         )
 
     @app.errorhandler(404)
@@ -2,52 +2,104 @@
 Caching system for JustEat application
 """
 
-import json
+import hashlib
+import heapq
 import pickle
-from datetime import datetime, timedelta
+import sys
+from collections import defaultdict
+from datetime import datetime, date
+from decimal import Decimal
+from time import monotonic
 from flask import current_app
+from constants import CACHE_TIMEOUT_MEDIUM
 import logging
 
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 
 class Cache:
-    """Simple in-memory cache implementation"""
+    """Simple in-memory cache implementation
+
+    Entries are stored as (value, expires_at) with monotonic-clock floats, so
+    a hit costs one monotonic() call and a float compare instead of datetime
+    construction. A min-heap of (expires_at, key) allows lazy eviction of
+    expired entries once the cache grows past max_size.
+    """
 
-    def __init__(self):
+    def __init__(self, max_size=10000):
         self._cache = {}
-        self._expiry = {}
+        self._exp_heap = []
+        self.max_size = max_size
+        self._bytes = 0
+        self._tags = defaultdict(set)
+
+    @staticmethod
+    def _entry_size(key, value):
+        """Approximate entry footprint (shallow, but O(1) to maintain)"""
+        return sys.getsizeof(key) + sys.getsizeof(value)
 
     def get(self, key):
         """Get value from cache"""
-        if key in self._cache:
-            if key in self._expiry and datetime.now() > self._expiry[key]:
-                # Expired, remove from cache
-                del self._cache[key]
-                del self._expiry[key]
-                return None
-            return self._cache[key]
-        return None
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and monotonic() > expires_at:
+            # Expired, remove from cache
+            del self._cache[key]
+            self._bytes -= self._entry_size(key, value)
+            return None
+        return value
 
-    def set(self, key, value, expiry_seconds=300):
-        """Set value in cache with expiry"""
-        self._cache[key] = value
+    def set(self, key, value, expiry_seconds=300, tags=()):
+        """Set value in cache with expiry, optionally indexed under tags"""
+        for tag in tags:
+            self._tags[tag].add(key)
         if expiry_seconds > 0:
-            self._expiry[key] = datetime.now(
-            ) + timedelta(seconds=expiry_seconds)
+            expires_at = monotonic() + expiry_seconds
+            heapq.heappush(self._exp_heap, (expires_at, key))
         else:
-            # Remove from expiry if it exists
-            self._expiry.pop(key, None)
+            expires_at = None
+        old = self._cache.get(key)
+        if old is not None:
+            self._bytes -= self._entry_size(key, old[0])
+        self._cache[key] = (value, expires_at)
+        self._bytes += self._entry_size(key, value)
+        if len(self._cache) > self.max_size:
+            self._evict_expired()
+
+    def _evict_expired(self):
+        """Pop already-expired entries off the heap to bound memory"""
+        now = monotonic()
+        while self._exp_heap and self._exp_heap[0][0] <= now:
+            _, key = heapq.heappop(self._exp_heap)
+            entry = self._cache.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= now:
+                del self._cache[key]
+                self._bytes -= self._entry_size(key, entry[0])
 
     def delete(self, key):
         """Delete key from cache"""
-        self._cache.pop(key, None)
-        self._expiry.pop(key, None)
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._entry_size(key, entry[0])
+
+    def invalidate_tag(self, tag):
+        """Drop every key indexed under tag (O(tagged keys), not O(cache))"""
+        for key in self._tags.pop(tag, ()):
+            self.delete(key)
 
     def clear(self):
         """Clear all cache"""
         self._cache.clear()
-        self._expiry.clear()
+        self._exp_heap.clear()
+        self._tags.clear()
+        self._bytes = 0
 
     def keys(self):
         """Get all cache keys"""
@@ -57,24 +109,32 @@ class Cache:
         """Get cache size"""
         return len(self._cache)
 
+    def memory_bytes(self):
+        """Approximate memory usage, tracked incrementally"""
+        return self._bytes
+
 
 # Global cache instance
 cache = Cache()
 
 
 def cache_key(*args, **kwargs):
-    """Generate cache key from arguments"""
-    key_parts = []
+    """Generate a short, stable cache key digest from arguments
+
+    blake2b digests are deterministic across processes (unlike the builtin
+    hash(), which is randomized per interpreter) and keep keys short.
+    """
+    h = hashlib.blake2b(digest_size=16)
     for arg in args:
         if hasattr(arg, 'id'):
-            key_parts.append(f"{arg.__class__.__name__}_{arg.id}")
+            h.update(f"{arg.__class__.__name__}_{arg.id}".encode())
         else:
-            key_parts.append(str(arg))
+            h.update(repr(arg).encode())
 
     for k, v in sorted(kwargs.items()):
-        key_parts.append(f"{k}_{v}")
+        h.update(f"{k}_{v}".encode())
 
-    return "_".join(key_parts)
+    return h.hexdigest()
 
 
 def cached(expiry_seconds=300):
@@ -142,12 +202,20 @@ def cache_analytics_data(expiry_seconds=3600):
 # Cache management functions
 
 
-def get_cache_stats():
-    """Get cache statistics"""
+def get_cache_stats(precise=False):
+    """Get cache statistics
+
+    The default memory figure is the incrementally tracked approximation;
+    precise=True keeps the old O(N) pickle traversal for debugging.
+    """
+    if precise:
+        memory_usage = len(pickle.dumps(cache._cache))
+    else:
+        memory_usage = cache.memory_bytes()
     return {
         'size': cache.size(),
         'keys': cache.keys(),
-        'memory_usage': len(pickle.dumps(cache._cache))
+        'memory_usage': memory_usage
     }
 
 
@@ -162,16 +230,22 @@ def warm_cache():
         restaurants = Restaurant.query.filter_by(is_active=True).all()
         for restaurant in restaurants:
             key = f"restaurant_{restaurant.id}"
-            cache.set(key, restaurant, 600)
+            cache.set(key, restaurant, 600,
+                      tags=(f"restaurant:{restaurant.id}",))
+
+        # Cache popular menu items (single query, bucketed per restaurant)
+        menu_items = MenuItem.query.filter(
+            MenuItem.restaurant_id.in_([r.id for r in restaurants]),
+            MenuItem.is_available == True
+        ).all()
+        items_by_restaurant = defaultdict(list)
+        for item in menu_items:
+            items_by_restaurant[item.restaurant_id].append(item)
 
-        # Cache popular menu items
         for restaurant in restaurants:
-            menu_items = MenuItem.query.filter_by(
-                restaurant_id=restaurant.id,
-                is_available=True
-            ).all()
             key = f"menu_items_{restaurant.id}"
-            cache.set(key, menu_items, 300)
+            cache.set(key, items_by_restaurant[restaurant.id], 300,
+                      tags=(f"restaurant:{restaurant.id}",))
 
         logger.info(f"Cache warmed up with {len(restaurants)} restaurants")
 
@@ -179,30 +253,86 @@ def warm_cache():
         logger.error(f"Error warming up cache: {str(e)}")
 
 
+# Slow-changing reference data: cities, cuisines and featured items move
+# rarely, so a medium TTL spares the DB the repeated list-endpoint reads
+
+
+@cached(CACHE_TIMEOUT_MEDIUM)
+def get_cities():
+    """Distinct restaurant cities"""
+    from models import db, Restaurant
+    return [city for (city,) in db.session.query(Restaurant.city).group_by(
+        Restaurant.city).order_by(Restaurant.city)]
+
+
+@cached(CACHE_TIMEOUT_MEDIUM)
+def get_cuisines():
+    """Distinct restaurant cuisine types"""
+    from models import db, Restaurant
+    return [c for (c,) in db.session.query(Restaurant.cuisine_type).group_by(
+        Restaurant.cuisine_type).order_by(Restaurant.cuisine_type)]
+
+
+@cached(CACHE_TIMEOUT_MEDIUM)
+def list_restaurant_choices():
+    """Active restaurants as (id, name) SelectField choice tuples
+
+    Two scalar columns instead of full Restaurant rows: the feedback
+    form only needs labels, not ORM instances.
+    """
+    from models import db, Restaurant
+    return [(r_id, name) for (r_id, name) in db.session.query(
+        Restaurant.id, Restaurant.name).filter_by(
+        is_active=True).order_by(Restaurant.name)]
+
+
+@cached(CACHE_TIMEOUT_MEDIUM)
+def list_special_items(limit=6):
+    """Available special items with their restaurant eagerly loaded
+
+    The eager load keeps cached instances usable outside the session that
+    produced them (templates read item.restaurant.name).
+    """
+    from models import MenuItem
+    from sqlalchemy.orm import joinedload
+    return MenuItem.query.options(joinedload(MenuItem.restaurant)).filter_by(
+        is_special=True, is_available=True).limit(limit).all()
+
+
+@cached(CACHE_TIMEOUT_MEDIUM)
+def list_deal_items(limit=6):
+    """Available deal-of-the-day items with their restaurant eagerly loaded"""
+    from models import MenuItem
+    from sqlalchemy.orm import joinedload
+    return MenuItem.query.options(joinedload(MenuItem.restaurant)).filter_by(
+        is_deal_of_day=True, is_available=True).limit(limit).all()
+
+
+def start_cache_warmer(app):
+    """Run warm_cache in a daemon thread so startup is not blocked
+
+    The warming queries run off the critical path: workers accept requests
+    immediately and the first few may just be cache misses.
+    """
+    import threading
+
+    def _warm():
+        with app.app_context():
+            warm_cache()
+
+    warmer = threading.Thread(target=_warm, daemon=True, name='cache-warmer')
+    warmer.start()
+    return warmer
+
+
 def clear_restaurant_cache(restaurant_id):
     """Clear cache for specific restaurant"""
-    patterns = [
-        f"restaurant_{restaurant_id}",
-        f"menu_items_{restaurant_id}",
-        f"analytics_{restaurant_id}",
-        f"reviews_{restaurant_id}"
-    ]
-
-    for pattern in patterns:
-        invalidate_cache(pattern)
+    cache.invalidate_tag(f"restaurant:{restaurant_id}")
 
 
 def clear_user_cache(user_id):
     """Clear cache for specific user"""
-    patterns = [
-        f"user_{user_id}",
-        f"orders_{user_id}",
-        f"cart_{user_id}",
-        f"recommendations_{user_id}"
-    ]
-
-    for pattern in patterns:
-        invalidate_cache(pattern)
+    cache.invalidate_tag(f"user:{user_id}")
 
 # Redis integration (for production)
 
@@ -214,6 +344,52 @@ class RedisCache:
         self.redis = redis_client
         self.default_expiry = 300
 
+    @staticmethod
+    def _pack_default(obj):
+        """Encode types msgpack cannot handle natively
+
+        Model instances are stored as a small (__model__, id) stub instead
+        of full ORM state, which halves the bytes over the wire; they are
+        rehydrated on get through the session identity map.
+        """
+        if isinstance(obj, Decimal):
+            return {'__decimal__': str(obj)}
+        if isinstance(obj, datetime):
+            return {'__datetime__': obj.isoformat()}
+        if isinstance(obj, date):
+            return {'__date__': obj.isoformat()}
+        if hasattr(obj, '__table__'):
+            return {'__model__': type(obj).__name__, 'id': obj.id}
+        return str(obj)
+
+    @staticmethod
+    def _unpack_hook(obj):
+        """Rebuild values encoded by _pack_default"""
+        if '__decimal__' in obj:
+            return Decimal(obj['__decimal__'])
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__date__' in obj:
+            return date.fromisoformat(obj['__date__'])
+        if '__model__' in obj:
+            from models import db
+            for mapper in db.Model.registry.mappers:
+                if mapper.class_.__name__ == obj['__model__']:
+                    return db.session.get(mapper.class_, obj['id'])
+        return obj
+
+    def _dumps(self, value):
+        if msgpack is not None:
+            return msgpack.packb(
+                value, default=self._pack_default, use_bin_type=True)
+        return pickle.dumps(value, protocol=5)
+
+    def _loads(self, raw):
+        if msgpack is not None:
+            return msgpack.unpackb(
+                raw, object_hook=self._unpack_hook, raw=False)
+        return pickle.loads(raw)
+
     def get(self, key):
         """Get value from Redis cache"""
         if not self.redis:
@@ -222,20 +398,28 @@ class RedisCache:
         try:
             value = self.redis.get(key)
             if value:
-                return json.loads(value)
+                return self._loads(value)
         except Exception as e:
             logger.error(f"Redis get error: {str(e)}")
 
         return None
 
-    def set(self, key, value, expiry_seconds=None):
-        """Set value in Redis cache"""
+    def set(self, key, value, expiry_seconds=None, tags=()):
+        """Set value in Redis cache, optionally indexed under tags"""
         if not self.redis:
             return False
 
         try:
             expiry = expiry_seconds or self.default_expiry
-            self.redis.setex(key, expiry, json.dumps(value, default=str))
+            # msgpack when available (smaller, faster than pickle/JSON for
+            # the analytics dicts); pickle otherwise so nothing breaks on a
+            # bare install
+            self.redis.setex(key, expiry, self._dumps(value))
+            for tag in tags:
+                # Tag index mirrors Cache._tags as a Redis set per tag,
+                # dropped wholesale by invalidate_tag; stale members just
+                # point at already-expired entries, which is harmless
+                self.redis.sadd(f"tag:{tag}", key)
             return True
         except Exception as e:
             logger.error(f"Redis set error: {str(e)}")
@@ -253,6 +437,22 @@ class RedisCache:
             logger.error(f"Redis delete error: {str(e)}")
             return False
 
+    def invalidate_tag(self, tag):
+        """Drop every key indexed under tag (O(tagged keys), not O(cache))"""
+        if not self.redis:
+            return False
+
+        try:
+            tag_key = f"tag:{tag}"
+            keys = self.redis.smembers(tag_key)
+            if keys:
+                self.redis.delete(*keys)
+            self.redis.delete(tag_key)
+            return True
+        except Exception as e:
+            logger.error(f"Redis invalidate_tag error: {str(e)}")
+            return False
+
     def clear(self):
         """Clear all cache"""
         if not self.redis:
@@ -295,12 +495,10 @@ def cache_middleware(expiry_seconds=300):
         def wrapper(*args, **kwargs):
             # Generate cache key from request
             from flask import request
-            key = f"response_{
-                func.__name__}_{
-                hash(
-                    str(
-                        request.args) + str(
-                        request.json))}"
+            h = hashlib.blake2b(digest_size=16)
+            h.update(request.full_path.encode())
+            h.update(request.get_data())
+            key = f"response_{func.__name__}_{h.hexdigest()}"
 
             # Try to get from cache
             result = cache.get(key)
@@ -2,6 +2,8 @@
 Constants for JustEat application
 """
 
+from types import MappingProxyType
+
 # Application Constants
 APP_NAME = "JustEat"
 APP_VERSION = "1.0.0"
@@ -21,14 +23,17 @@ ORDER_STATUS_DELIVERED = "delivered"
 ORDER_STATUS_CANCELLED = "cancelled"
 
 # Order Status Options
-ORDER_STATUS_CHOICES = [
+ORDER_STATUS_CHOICES = (
     (ORDER_STATUS_PENDING, "Pending"),
     (ORDER_STATUS_CONFIRMED, "Confirmed"),
     (ORDER_STATUS_PREPARING, "Preparing"),
     (ORDER_STATUS_READY, "Ready"),
     (ORDER_STATUS_DELIVERED, "Delivered"),
     (ORDER_STATUS_CANCELLED, "Cancelled")
-]
+)
+
+# O(1) status -> display label lookup (avoids scanning the choice tuples)
+ORDER_STATUS_LABELS = MappingProxyType(dict(ORDER_STATUS_CHOICES))
 
 # Feedback Statuses
 FEEDBACK_STATUS_OPEN = "open"
@@ -36,14 +41,17 @@ FEEDBACK_STATUS_IN_PROGRESS = "in_progress"
 FEEDBACK_STATUS_RESOLVED = "resolved"
 
 # Feedback Status Options
-FEEDBACK_STATUS_CHOICES = [
+FEEDBACK_STATUS_CHOICES = (
     (FEEDBACK_STATUS_OPEN, "Open"),
     (FEEDBACK_STATUS_IN_PROGRESS, "In Progress"),
     (FEEDBACK_STATUS_RESOLVED, "Resolved")
-]
+)
+
+FEEDBACK_STATUS_LABELS = MappingProxyType(dict(FEEDBACK_STATUS_CHOICES))
 
 # Cuisine Types
-CUISINE_TYPES = [
+# Immutable for iteration order; the frozenset below gives O(1) membership
+CUISINE_TYPES = (
     "Italian",
     "Chinese",
     "Indian",
@@ -54,10 +62,11 @@ CUISINE_TYPES = [
     "Mediterranean",
     "Fast Food",
     "Desserts"
-]
+)
+CUISINE_TYPES_SET = frozenset(CUISINE_TYPES)
 
 # Menu Item Categories
-MENU_CATEGORIES = [
+MENU_CATEGORIES = (
     "Appetizers",
     "Main Course",
     "Desserts",
@@ -68,7 +77,18 @@ MENU_CATEGORIES = [
     "Pasta",
     "Sandwiches",
     "Sides"
-]
+)
+MENU_CATEGORIES_SET = frozenset(MENU_CATEGORIES)
+
+# Price filter buckets for the restaurant browse pages: label -> (low,
+# high); an open-ended bucket has high=None
+PRICE_FILTER_RANGES = MappingProxyType({
+    "0-200": (0, 200),
+    "201-500": (201, 500),
+    "501-1000": (501, 1000),
+    "1001-1500": (1001, 1500),
+    "1501+": (1501, None),
+})
 
 # Rating Scale
 MIN_RATING = 1
@@ -109,7 +129,7 @@ MAX_ADDRESS_LENGTH = 500
 
 # File Upload Limits
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
-ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+ALLOWED_IMAGE_EXTENSIONS = frozenset({'png', 'jpg', 'jpeg', 'gif', 'webp'})
 
 # Time Formats
 DATE_FORMAT = "%Y-%m-%d"
@@ -145,20 +165,20 @@ SESSION_TIMEOUT = 3600  # 1 hour
 CSRF_TOKEN_TIMEOUT = 3600  # 1 hour
 
 # Email Templates
-EMAIL_TEMPLATES = {
+EMAIL_TEMPLATES = MappingProxyType({
     'welcome': 'emails/welcome.html',
     'order_confirmation': 'emails/order_confirmation.html',
     'order_status_update': 'emails/order_status_update.html',
     'password_reset': 'emails/password_reset.html'
-}
+})
 
 # Notification Types
-NOTIFICATION_TYPES = {
+NOTIFICATION_TYPES = MappingProxyType({
     'INFO': 'info',
     'SUCCESS': 'success',
     'WARNING': 'warning',
     'ERROR': 'error'
-}
+})
 
 # API Response Codes
 API_SUCCESS = 200
@@ -185,16 +205,16 @@ STATIC_FOLDER = "static"
 TEMPLATE_FOLDER = "templates"
 
 # Logging
-LOG_LEVELS = {
+LOG_LEVELS = MappingProxyType({
     'DEBUG': 10,
     'INFO': 20,
     'WARNING': 30,
     'ERROR': 40,
     'CRITICAL': 50
-}
+})
 
 # Error Messages
-ERROR_MESSAGES = {
+ERROR_MESSAGES = MappingProxyType({
     'GENERIC_ERROR': 'An unexpected error occurred. Please try again.',
     'VALIDATION_ERROR': 'Please check your input and try again.',
     'AUTHENTICATION_ERROR': 'Please log in to access this feature.',
@@ -203,10 +223,10 @@ ERROR_MESSAGES = {
     'RATE_LIMIT_ERROR': 'Too many requests. Please try again later.',
     'DATABASE_ERROR': 'A database error occurred. Please try again.',
     'NETWORK_ERROR': 'A network error occurred. Please check your connection.'
-}
+})
 
 # Success Messages
-SUCCESS_MESSAGES = {
+SUCCESS_MESSAGES = MappingProxyType({
     'LOGIN_SUCCESS': 'Login successful!',
     'LOGOUT_SUCCESS': 'You have been logged out successfully.',
     'REGISTRATION_SUCCESS': 'Registration successful!',
@@ -220,10 +240,10 @@ SUCCESS_MESSAGES = {
     'MENU_ITEM_UPDATED_SUCCESS': 'Menu item updated successfully!',
     'MENU_ITEM_DELETED_SUCCESS': 'Menu item deleted successfully!',
     'RESTAURANT_REGISTERED_SUCCESS': 'Restaurant registered successfully!'
-}
+})
 
 # Default Values
-DEFAULT_VALUES = {
+DEFAULT_VALUES = MappingProxyType({
     'USER_IS_ACTIVE': True,
     'RESTAURANT_IS_ACTIVE': True,
     'MENU_ITEM_IS_AVAILABLE': True,
@@ -232,10 +252,10 @@ DEFAULT_VALUES = {
     'ORDER_STATUS': ORDER_STATUS_PENDING,
     'FEEDBACK_STATUS': FEEDBACK_STATUS_OPEN,
     'CART_QUANTITY': 1
-}
+})
 
 # Feature Flags
-FEATURES = {
+FEATURES = MappingProxyType({
     'ENABLE_REVIEWS': True,
     'ENABLE_FEEDBACK': True,
     'ENABLE_RECOMMENDATIONS': True,
@@ -243,29 +263,29 @@ FEATURES = {
     'ENABLE_NOTIFICATIONS': True,
     'ENABLE_CACHING': True,
     'ENABLE_RATE_LIMITING': True
-}
+})
 
 # API Endpoints
-API_ENDPOINTS = {
+API_ENDPOINTS = MappingProxyType({
     'RESTAURANTS': '/api/restaurants',
     'RESTAURANT_MENU': '/api/restaurant/<int:restaurant_id>/menu',
     'RECOMMENDATIONS': '/api/recommendations',
     'ORDER_STATUS': '/api/order-status/<int:order_id>',
     'CART_COUNT': '/api/cart-count'
-}
+})
 
 # Social Media Links (placeholder)
-SOCIAL_LINKS = {
+SOCIAL_LINKS = MappingProxyType({
     'FACEBOOK': 'https://facebook.com/justeat',
     'TWITTER': 'https://twitter.com/justeat',
     'INSTAGRAM': 'https://instagram.com/justeat',
     'LINKEDIN': 'https://linkedin.com/company/justeat'
-}
+})
 
 # Contact Information
-CONTACT_INFO = {
+CONTACT_INFO = MappingProxyType({
     'EMAIL': 'support@justeat.com',
     'PHONE': '+1 (555) 123-4567',
     'ADDRESS': '123 Food Street, City, State 12345',
     'HOURS': 'Monday - Friday: 9:00 AM - 6:00 PM'
-}
+})
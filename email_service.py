@@ -3,13 +3,245 @@ Email service for JustEat application
 """
 
 import smtplib
+from smtplib import SMTPException, SMTPServerDisconnected
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from flask import current_app, render_template
+from flask import current_app
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import atexit
 import logging
+import queue
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Dedicated pool for SMTP deliveries so slow mail servers never block
+# request workers; sends are queued and the request returns immediately.
+# Four threads saturate the SMTPPool below at our volumes; an asyncio/
+# aiosmtplib loop would only pay off at hundreds of concurrent sends,
+# at the cost of a second concurrency model and a new dependency.
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='email')
+
+
+def _log_send_failure(future):
+    """Surface background send errors in the log"""
+    try:
+        future.result()
+    except Exception:
+        logger.error("Background email send failed", exc_info=True)
+
+
+# Plain-text bodies as module constants, written flush-left so nothing
+# re-strips indentation per send and no leading whitespace ships over
+# the wire; each send formats only the fields that vary
+TXT_WELCOME = """\
+Welcome to JustEat!
+
+Hi {first_name},
+
+Thank you for joining JustEat! We're excited to have you on board.
+
+You can now:
+- Browse restaurants and menus
+- Place orders
+- Track your orders
+- Leave reviews
+
+If you have any questions, feel free to contact our support team.
+
+Best regards,
+The JustEat Team"""
+
+TXT_ORDER_CONFIRMATION = """\
+Order Confirmation
+
+Hi {first_name},
+
+Your order has been confirmed!
+
+Order Number: {order_number}
+Restaurant: {restaurant_name}
+Total Amount: ${total_amount:.2f}
+
+We'll notify you when your order is ready.
+
+Thank you for choosing JustEat!"""
+
+TXT_ORDER_STATUS_UPDATE = """\
+Order Status Update
+
+Hi {first_name},
+
+Your order status has been updated:
+
+Order Number: {order_number}
+Restaurant: {restaurant_name}
+New Status: {status}
+
+Thank you for choosing JustEat!"""
+
+TXT_PASSWORD_RESET = """\
+Password Reset Request
+
+Hi {first_name},
+
+You requested a password reset for your JustEat account.
+
+Click the link below to reset your password:
+{reset_url}
+
+If you didn't request this, please ignore this email.
+
+Best regards,
+The JustEat Team"""
+
+TXT_RESTAURANT_CONFIRMATION = """\
+Restaurant Registration Confirmed
+
+Hi {first_name},
+
+Your restaurant "{restaurant_name}" has been successfully registered on JustEat!
+
+You can now:
+- Manage your menu
+- Process orders
+- View analytics
+- Respond to reviews
+
+Welcome to the JustEat family!"""
+
+TXT_REVIEW_NOTIFICATION = """\
+New Review Received
+
+Hi {first_name},
+
+Your restaurant "{restaurant_name}" received a new review:
+
+Rating: {rating}/5 stars
+Customer: {customer_name}
+
+{comment_line}
+
+Log in to your restaurant dashboard to respond."""
+
+TXT_FEEDBACK_NOTIFICATION = """\
+New Feedback Received
+
+Hi {first_name},
+
+{source} received new feedback:
+
+Subject: {subject}
+From: {customer_name}
+
+Message: {message}
+
+Log in to respond to the feedback."""
+
+
+class SMTPPool:
+    """Bounded pool of authenticated SMTP connections
+
+    A single persistent connection serializes concurrent sends from the
+    executor workers; a small pool lets them dispatch in parallel while
+    still amortizing the TLS + auth handshake across many messages.
+    """
+
+    # Upper bound on live connections — enough for the executor's four
+    # workers without piling sessions onto the provider
+    MAX_CONN = 5
+    # Recycle after this many messages so long-lived connections stay
+    # within provider per-connection limits
+    MAX_MESSAGES_PER_CONNECTION = 100
+
+    def __init__(self, server, port, username, password):
+        self._server = server
+        self._port = port
+        self._username = username
+        self._password = password
+        self._pool = queue.Queue(maxsize=self.MAX_CONN)
+        self._created = 0
+        self._lock = threading.Lock()
+        atexit.register(self.close_all)
+
+    def _connect(self):
+        """Open, STARTTLS-negotiate and log in a fresh connection"""
+        conn = smtplib.SMTP(self._server, self._port)
+        conn.ehlo()
+        conn.starttls()
+        conn.ehlo()
+        conn.login(self._username, self._password)
+        conn.pool_sent = 0
+        return conn
+
+    def _discard(self, conn):
+        """Quit a connection and free its pool slot"""
+        try:
+            conn.quit()
+        except (SMTPException, OSError):
+            pass
+        with self._lock:
+            self._created -= 1
+
+    @contextmanager
+    def acquire(self):
+        """Check out a connected server handle for one send
+
+        Pops an idle connection (revalidated with NOOP) or opens a new
+        one while under MAX_CONN; blocks when all are in flight. A clean
+        exit counts the send and returns the connection, recycling it at
+        MAX_MESSAGES_PER_CONNECTION; any error discards it so the slot
+        is freed and the caller's retry gets a fresh one.
+        """
+        conn = None
+        while conn is None:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if self._created < self.MAX_CONN:
+                        self._created += 1
+                        break
+                conn = self._pool.get()
+            if conn is not None:
+                try:
+                    if conn.noop()[0] == 250:
+                        break
+                except (SMTPException, OSError):
+                    pass
+                self._discard(conn)
+                conn = None
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            yield conn
+        except BaseException:
+            # Discard on *any* failure, not just SMTP/socket errors: a
+            # ValueError out of send_message that skipped the discard
+            # would leak one of the MAX_CONN slots for good
+            self._discard(conn)
+            raise
+        conn.pool_sent += 1
+        if conn.pool_sent >= self.MAX_MESSAGES_PER_CONNECTION:
+            self._discard(conn)
+        else:
+            self._pool.put(conn)
+
+    def close_all(self):
+        """Quit every idle connection in the pool"""
+        while True:
+            try:
+                self._discard(self._pool.get_nowait())
+            except queue.Empty:
+                break
+
 
 class EmailService:
     """Email service for sending notifications"""
@@ -23,32 +255,77 @@ class EmailService:
         self.from_email = current_app.config.get(
             'FROM_EMAIL', 'noreply@justeat.com')
         self.from_name = current_app.config.get('FROM_NAME', 'JustEat')
+        # Snapshot the remaining config the send_* builders need, so the
+        # hot path never resolves the current_app LocalProxy per call
+        self.app_name = current_app.config.get('APP_NAME', 'JustEat')
+        self.base_url = current_app.config.get(
+            'BASE_URL', 'http://localhost:5000')
+        self.admin_email = current_app.config.get('ADMIN_EMAIL')
+        # The real app object (not the LocalProxy) so executor workers
+        # can open their own app context for rendering
+        self._app = current_app._get_current_object()
+
+        # Pooled SMTP connections reused across sends: the TLS + auth
+        # handshake dominates per-message latency otherwise, and a pool
+        # lets the executor workers deliver concurrently
+        self._pool = SMTPPool(self.smtp_server, self.smtp_port,
+                              self.smtp_username, self.smtp_password)
+
+        # Compiled email templates, fetched once and kept for the life
+        # of the service: repeat renders skip render_template's per-call
+        # lookup and signal dispatch
+        self._templates = {}
+
+        # Subject lines bound once at init; each send does a single
+        # format_map over the message's fields instead of rebuilding
+        # the constant parts per call
+        self._subjects = {
+            'welcome': f"Welcome to {self.app_name}!",
+            'order_confirmation': "Order Confirmation - {order_number}",
+            'order_status_update': "Order Update - {order_number}",
+            'password_reset': "Password Reset Request",
+            'restaurant_confirmation': "Restaurant Registration Confirmed",
+            'review_notification': "New Review for {restaurant_name}",
+            'feedback_notification': "New Feedback for {restaurant_name}",
+        }
+
+    def _render(self, name, **context):
+        """Render emails/<name>.html from the compiled-template cache"""
+        template = self._templates.get(name)
+        if template is None:
+            template = current_app.jinja_env.get_template(
+                f'emails/{name}.html')
+            self._templates[name] = template
+        return template.render(**context)
 
     def send_email(self, to_email, subject, html_content, text_content=None):
         """Send email to recipient"""
         try:
-            # Create message
-            msg = MIMEMultipart('alternative')
+            # Create message. HTML-only mails (the in-app notification
+            # path) go out as a bare text/html part: no multipart
+            # container means one less copy of the body and no boundary
+            # bookkeeping when flattening.
+            html_part = MIMEText(html_content, 'html', 'utf-8')
+            if text_content:
+                msg = MIMEMultipart('alternative')
+                msg.attach(MIMEText(text_content, 'plain'))
+                msg.attach(html_part)
+            else:
+                msg = html_part
             msg['Subject'] = subject
             msg['From'] = f"{self.from_name} <{self.from_email}>"
             msg['To'] = to_email
 
-            # Add text content
-            if text_content:
-                text_part = MIMEText(text_content, 'plain')
-                msg.attach(text_part)
-
-            # Add HTML content
-            html_part = MIMEText(html_content, 'html')
-            msg.attach(html_part)
-
-            # Send email
+            # Send email over a pooled connection; a stale handle is
+            # discarded by the pool and the send retried once on a
+            # fresh one
             if self.smtp_username and self.smtp_password:
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
-                server.quit()
+                try:
+                    with self._pool.acquire() as server:
+                        server.send_message(msg)
+                except (SMTPServerDisconnected, SMTPException):
+                    with self._pool.acquire() as server:
+                        server.send_message(msg)
                 logger.info(f"Email sent successfully to {to_email}")
                 return True
             else:
@@ -60,201 +337,218 @@ class EmailService:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
             return False
 
-    def send_welcome_email(self, user):
-        """Send welcome email to new user"""
-        subject = f"Welcome to {
-            current_app.config.get(
-                'APP_NAME', 'JustEat')}!"
+    def send_bulk(self, to_emails, subject, html_content, text_content=None):
+        """Send one identical message to many recipients at once
 
-        html_content = render_template('emails/welcome.html', user=user)
-        text_content = f"""
-        Welcome to JustEat!
+        For promo-style fan-outs the body does not vary per recipient,
+        so one MAIL FROM, a RCPT TO per address and a single DATA
+        replace N full transactions — the body crosses the wire once.
+        Recipients land in the envelope only (BCC-style); refused
+        addresses are logged and the rest still go out.
+        """
+        if not to_emails:
+            return True
+        try:
+            html_part = MIMEText(html_content, 'html', 'utf-8')
+            if text_content:
+                msg = MIMEMultipart('alternative')
+                msg.attach(MIMEText(text_content, 'plain'))
+                msg.attach(html_part)
+            else:
+                msg = html_part
+            msg['Subject'] = subject
+            msg['From'] = f"{self.from_name} <{self.from_email}>"
 
-        Hi {user.first_name},
+            if self.smtp_username and self.smtp_password:
+                try:
+                    with self._pool.acquire() as server:
+                        refused = server.send_message(
+                            msg, to_addrs=list(to_emails))
+                except (SMTPServerDisconnected, SMTPException):
+                    with self._pool.acquire() as server:
+                        refused = server.send_message(
+                            msg, to_addrs=list(to_emails))
+                if refused:
+                    logger.warning(
+                        f"Bulk email refused for {sorted(refused)}")
+                logger.info(
+                    f"Bulk email sent to {len(to_emails) - len(refused)} "
+                    f"of {len(to_emails)} recipients")
+                return True
+            else:
+                logger.warning(
+                    "SMTP credentials not configured, email not sent")
+                return False
 
-        Thank you for joining JustEat! We're excited to have you on board.
+        except Exception as e:
+            logger.error(f"Failed to send bulk email: {str(e)}")
+            return False
 
-        You can now:
-        - Browse restaurants and menus
-        - Place orders
-        - Track your orders
-        - Leave reviews
+    def send_bulk_async(self, to_emails, subject,
+                        html_content, text_content=None):
+        """Queue a bulk send on the background pool"""
+        future = _executor.submit(
+            self.send_bulk, to_emails, subject, html_content, text_content)
+        future.add_done_callback(_log_send_failure)
+        return future
 
-        If you have any questions, feel free to contact our support team.
+    def send_email_async(self, to_email, subject,
+                         html_content, text_content=None):
+        """Queue the send on the background pool and return immediately
 
-        Best regards,
-        The JustEat Team
+        Content must already be rendered — the worker thread has no
+        request context. Failures are logged via the future callback.
         """
+        future = _executor.submit(
+            self.send_email, to_email, subject, html_content, text_content)
+        future.add_done_callback(_log_send_failure)
+        return future
+
+    def _render_and_send(self, template_name, entity_ids, context,
+                         to_email, subject, text_content):
+        """Executor task: re-fetch entities, render and send
+
+        Runs on the worker thread under a request context bound to
+        BASE_URL — the templates build absolute links with
+        url_for(_external=True), which needs a host to resolve against.
+        Entities are re-fetched by primary key into the worker's session
+        rather than carried across threads as detached instances.
+        """
+        with self._app.test_request_context(base_url=self.base_url):
+            from models import db
+            for name, (model, obj_id) in entity_ids.items():
+                context[name] = db.session.get(model, obj_id)
+            html_content = self._render(template_name, **context)
+            return self.send_email(
+                to_email, subject, html_content, text_content)
+
+    def send_template_async(self, template_name, entity_ids, to_email,
+                            subject, text_content=None, **context):
+        """Queue render + send of emails/<template_name>.html
+
+        entity_ids maps template variable names to (Model, id) pairs
+        resolved in the worker; extra keyword arguments pass through to
+        the template as-is. The request thread only pays for building
+        this call — template rendering and SMTP both happen on the
+        email executor.
+        """
+        future = _executor.submit(
+            self._render_and_send, template_name, entity_ids, context,
+            to_email, subject, text_content)
+        future.add_done_callback(_log_send_failure)
+        return future
 
-        return self.send_email(user.email, subject, html_content, text_content)
-
-    def send_order_confirmation(self, order):
-        """Send order confirmation email"""
-        subject = f"Order Confirmation - {order.order_number}"
-
-        html_content = render_template(
-            'emails/order_confirmation.html', order=order)
-        text_content = f"""
-        Order Confirmation
-
-        Hi {order.customer.first_name},
+    def send_welcome_email(self, user):
+        """Send welcome email to new user"""
+        subject = self._subjects['welcome']
 
-        Your order has been confirmed!
+        text_content = TXT_WELCOME.format(first_name=user.first_name)
 
-        Order Number: {order.order_number}
-        Restaurant: {order.restaurant.name}
-        Total Amount: ${order.total_amount:.2f}
+        from models import User
+        return self.send_template_async(
+            'welcome', {'user': (User, user.id)},
+            user.email, subject, text_content)
 
-        We'll notify you when your order is ready.
+    def send_order_confirmation(self, order):
+        """Send order confirmation email"""
+        subject = self._subjects['order_confirmation'].format_map(
+            {'order_number': order.order_number})
 
-        Thank you for choosing JustEat!
-        """
+        text_content = TXT_ORDER_CONFIRMATION.format(
+            first_name=order.customer.first_name,
+            order_number=order.order_number,
+            restaurant_name=order.restaurant.name,
+            total_amount=order.total_amount)
 
-        return self.send_email(
-            order.customer.email,
-            subject,
-            html_content,
-            text_content)
+        from models import Order
+        return self.send_template_async(
+            'order_confirmation', {'order': (Order, order.id)},
+            order.customer.email, subject, text_content)
 
     def send_order_status_update(self, order):
         """Send order status update email"""
-        subject = f"Order Update - {order.order_number}"
-
-        html_content = render_template(
-            'emails/order_status_update.html', order=order)
-        text_content = f"""
-        Order Status Update
-
-        Hi {order.customer.first_name},
+        subject = self._subjects['order_status_update'].format_map(
+            {'order_number': order.order_number})
 
-        Your order status has been updated:
-
-        Order Number: {order.order_number}
-        Restaurant: {order.restaurant.name}
-        New Status: {order.status.title()}
-
-        Thank you for choosing JustEat!
-        """
+        text_content = TXT_ORDER_STATUS_UPDATE.format(
+            first_name=order.customer.first_name,
+            order_number=order.order_number,
+            restaurant_name=order.restaurant.name,
+            status=order.status.title())
 
-        return self.send_email(
-            order.customer.email,
-            subject,
-            html_content,
-            text_content)
+        from models import Order
+        return self.send_template_async(
+            'order_status_update', {'order': (Order, order.id)},
+            order.customer.email, subject, text_content)
 
     def send_password_reset(self, user, reset_token):
         """Send password reset email"""
-        subject = "Password Reset Request"
+        subject = self._subjects['password_reset']
 
-        reset_url = f"{
-            current_app.config.get(
-                'BASE_URL',
-                'http://localhost:5000')}/auth/reset-password?token={reset_token}"
+        reset_url = (
+            f"{self.base_url}/auth/reset-password?token={reset_token}")
 
-        html_content = render_template('emails/password_reset.html',
-                                       user=user, reset_url=reset_url)
-        text_content = f"""
-        Password Reset Request
+        text_content = TXT_PASSWORD_RESET.format(
+            first_name=user.first_name, reset_url=reset_url)
 
-        Hi {user.first_name},
-
-        You requested a password reset for your JustEat account.
-
-        Click the link below to reset your password:
-        {reset_url}
-
-        If you didn't request this, please ignore this email.
-
-        Best regards,
-        The JustEat Team
-        """
-
-        return self.send_email(user.email, subject, html_content, text_content)
+        from models import User
+        return self.send_template_async(
+            'password_reset', {'user': (User, user.id)},
+            user.email, subject, text_content, reset_url=reset_url)
 
     def send_restaurant_registration_confirmation(self, restaurant):
         """Send restaurant registration confirmation"""
-        subject = "Restaurant Registration Confirmed"
-
-        html_content = render_template('emails/restaurant_confirmation.html',
-                                       restaurant=restaurant)
-        text_content = f"""
-        Restaurant Registration Confirmed
+        subject = self._subjects['restaurant_confirmation']
 
-        Hi {restaurant.owner.first_name},
+        text_content = TXT_RESTAURANT_CONFIRMATION.format(
+            first_name=restaurant.owner.first_name,
+            restaurant_name=restaurant.name)
 
-        Your restaurant "{restaurant.name}" has been successfully registered on JustEat!
-
-        You can now:
-        - Manage your menu
-        - Process orders
-        - View analytics
-        - Respond to reviews
-
-        Welcome to the JustEat family!
-        """
-
-        return self.send_email(
-            restaurant.owner.email,
-            subject,
-            html_content,
-            text_content)
+        from models import Restaurant
+        return self.send_template_async(
+            'restaurant_confirmation',
+            {'restaurant': (Restaurant, restaurant.id)},
+            restaurant.owner.email, subject, text_content)
 
     def send_review_notification(self, review):
         """Send notification when restaurant receives a review"""
-        subject = f"New Review for {review.restaurant.name}"
-
-        html_content = render_template(
-            'emails/review_notification.html', review=review)
-        text_content = f"""
-        New Review Received
-        
-        Hi {review.restaurant.owner.first_name},
-        
-        Your restaurant "{review.restaurant.name}" received a new review:
-        
-        Rating: {review.rating}/5 stars
-        Customer: {review.user.first_name} {review.user.last_name}
-        
-        {f'Comment: {review.comment}' if review.comment else ''}
-
-        Log in to your restaurant dashboard to respond.
-        """
-
-        return self.send_email(
-            review.restaurant.owner.email,
-            subject,
-            html_content,
-            text_content)
+        subject = self._subjects['review_notification'].format_map(
+            {'restaurant_name': review.restaurant.name})
+
+        text_content = TXT_REVIEW_NOTIFICATION.format(
+            first_name=review.restaurant.owner.first_name,
+            restaurant_name=review.restaurant.name,
+            rating=review.rating,
+            customer_name=f"{review.user.first_name} {review.user.last_name}",
+            comment_line=(f'Comment: {review.comment}'
+                          if review.comment else ''))
+
+        from models import Review
+        return self.send_template_async(
+            'review_notification', {'review': (Review, review.id)},
+            review.restaurant.owner.email, subject, text_content)
 
     def send_feedback_notification(self, feedback):
         """Send notification when restaurant receives feedback"""
-        subject = f"New Feedback for {
-            feedback.restaurant.name if feedback.restaurant else 'JustEat'}"
-
-        html_content = render_template(
-            'emails/feedback_notification.html', feedback=feedback)
-        text_content = f"""
-        New Feedback Received
-
-        Hi {feedback.restaurant.owner.first_name if feedback.restaurant else 'Admin'},
-
-        {"Your restaurant" if feedback.restaurant else "JustEat"} received new feedback:
-
-        Subject: {feedback.subject}
-        From: {feedback.user.first_name} {feedback.user.last_name}
-
-        Message: {feedback.message}
-
-        Log in to respond to the feedback.
-        """
-
-        recipient_email = feedback.restaurant.owner.email if feedback.restaurant else current_app.config.get(
-            'ADMIN_EMAIL')
-        return self.send_email(
-            recipient_email,
-            subject,
-            html_content,
-            text_content)
+        subject = self._subjects['feedback_notification'].format_map(
+            {'restaurant_name': feedback.restaurant.name
+             if feedback.restaurant else self.app_name})
+
+        text_content = TXT_FEEDBACK_NOTIFICATION.format(
+            first_name=(feedback.restaurant.owner.first_name
+                        if feedback.restaurant else 'Admin'),
+            source=('Your restaurant' if feedback.restaurant else 'JustEat'),
+            subject=feedback.subject,
+            customer_name=(
+                f"{feedback.user.first_name} {feedback.user.last_name}"),
+            message=feedback.message)
+
+        recipient_email = (feedback.restaurant.owner.email
+                           if feedback.restaurant else self.admin_email)
+        from models import Feedback
+        return self.send_template_async(
+            'feedback_notification', {'feedback': (Feedback, feedback.id)},
+            recipient_email, subject, text_content)
 
 
 # Global email service instance
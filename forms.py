@@ -1,9 +1,48 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, TextAreaField, SelectField, IntegerField, DecimalField, BooleanField, TimeField, SubmitField, DateTimeField
 from wtforms.validators import DataRequired, Email, Length, NumberRange, ValidationError, Optional
+from constants import ORDER_STATUS_CHOICES
 from models import User, Restaurant
 from flask_wtf.file import FileField, FileAllowed
 
+# Static SelectField choices, shared across the forms below instead of
+# re-spelling the same literals per class
+CUISINE_CHOICES = (
+    ("North Indian", "North Indian"),
+    ("South Indian", "South Indian"),
+    ("Rajasthani/Gujarati", "Rajasthani/Gujarati"),
+    ("Mughlai", "Mughlai"),
+    ("Street Food", "Street Food"),
+)
+CATEGORY_CHOICES = (
+    ("Appetizers", "Appetizers"),
+    ("Main Course", "Main Course"),
+    ("Breakfast", "Breakfast"),
+    ("Snacks", "Snacks"),
+    ("Sides", "Sides"),
+    ("Desserts", "Desserts"),
+    ("Beverages", "Beverages"),
+)
+DIET_TYPE_CHOICES = (('veg', 'Veg'), ('non-veg', 'Non-Veg'))
+RATING_CHOICES = tuple((n, f"{n} Star" if n == 1 else f"{n} Stars")
+                       for n in range(1, 6))
+CUISINE_FILTER_CHOICES = (("", "All Cuisines"),) + CUISINE_CHOICES
+LOCATION_FILTER_CHOICES = (
+    ("", "All Locations"),
+    ("New Delhi", "New Delhi"),
+    ("Bengaluru", "Bengaluru"),
+    ("Ahmedabad", "Ahmedabad"),
+    ("Kolkata", "Kolkata"),
+    ("Hyderabad", "Hyderabad"),
+)
+PRICE_FILTER_CHOICES = (
+    ("", "All Prices"),
+    ("0-100", "₹0 - ₹100"),
+    ("100-300", "₹100 - ₹300"),
+    ("300-500", "₹300 - ₹500"),
+    ("500+", "₹500+"),
+)
+
 
 class LoginForm(FlaskForm):
     """Login form for both customers and restaurant owners"""
@@ -34,16 +73,7 @@ class RestaurantRegistrationForm(FlaskForm):
                        DataRequired(), Length(max=100)])
     description = TextAreaField('Description', validators=[DataRequired()])
     cuisine_type = SelectField(
-        "Cuisine Type",
-        choices=[
-            ("North Indian", "North Indian"),
-            ("South Indian", "South Indian"),
-            ("Rajasthani/Gujarati", "Rajasthani/Gujarati"),
-            ("Mughlai", "Mughlai"),
-            ("Street Food", "Street Food"),
-        ],
-        validators=[DataRequired()],
-    )
+        "Cuisine Type", choices=CUISINE_CHOICES, validators=[DataRequired()])
     address = TextAreaField('Address', validators=[DataRequired()])
     city = StringField('City', validators=[DataRequired(), Length(max=100)])
     state = StringField('State', validators=[DataRequired(), Length(max=50)])
@@ -70,25 +100,13 @@ class MenuItemForm(FlaskForm):
     price = DecimalField('Price', validators=[
                          DataRequired(), NumberRange(min=0.01)])
     category = SelectField(
-        "Category",
-        choices=[
-            ("Appetizers", "Appetizers"),
-            ("Main Course", "Main Course"),
-            ("Breakfast", "Breakfast"),
-            ("Snacks", "Snacks"),
-            ("Sides", "Sides"),
-            ("Desserts", "Desserts"),
-            ("Beverages", "Beverages"),
-        ],
-        validators=[DataRequired()],
-    )
+        "Category", choices=CATEGORY_CHOICES, validators=[DataRequired()])
     preparation_time = IntegerField(
         'Preparation Time (minutes)', validators=[NumberRange(min=1)])
     is_available = BooleanField('Available')
     is_special = BooleanField('Today\'s Special')
     is_deal_of_day = BooleanField('Deal of the Day')
-    diet_type = SelectField('Diet Type',
-                            choices=[('veg', 'Veg'), ('non-veg', 'Non-Veg')],
+    diet_type = SelectField('Diet Type', choices=DIET_TYPE_CHOICES,
                             validators=[DataRequired()])
 
     # Added image upload field
@@ -101,26 +119,15 @@ class MenuItemForm(FlaskForm):
 
 class OrderStatusForm(FlaskForm):
     """Order status update form"""
-    status = SelectField('Status', choices=[
-        ('pending', 'Pending'),
-        ('confirmed', 'Confirmed'),
-        ('preparing', 'Preparing'),
-        ('ready', 'Ready'),
-        ('delivered', 'Delivered'),
-        ('cancelled', 'Cancelled')
-    ], validators=[DataRequired()])
+    status = SelectField('Status', choices=ORDER_STATUS_CHOICES,
+                         validators=[DataRequired()])
     submit = SubmitField('Update Status')
 
 
 class ReviewForm(FlaskForm):
     """Review form"""
-    rating = SelectField('Rating', choices=[
-        (1, '1 Star'),
-        (2, '2 Stars'),
-        (3, '3 Stars'),
-        (4, '4 Stars'),
-        (5, '5 Stars')
-    ], validators=[DataRequired()], coerce=int)
+    rating = SelectField('Rating', choices=RATING_CHOICES,
+                         validators=[DataRequired()], coerce=int)
     comment = TextAreaField('Comment')
     submit = SubmitField('Submit Review')
 
@@ -156,37 +163,11 @@ class SearchForm(FlaskForm):
     """Search form"""
     search = StringField('Search', validators=[Length(max=100)])
     cuisine_filter = SelectField(
-        "Cuisine Type",
-        choices=[
-            ("", "All Cuisines"),
-            ("North Indian", "North Indian"),
-            ("South Indian", "South Indian"),
-            ("Rajasthani/Gujarati", "Rajasthani/Gujarati"),
-            ("Mughlai", "Mughlai"),
-            ("Street Food", "Street Food"),
-        ],
-    )
+        "Cuisine Type", choices=CUISINE_FILTER_CHOICES)
     location_filter = SelectField(
-        "Location",
-        choices=[
-            ("", "All Locations"),
-            ("New Delhi", "New Delhi"),
-            ("Bengaluru", "Bengaluru"),
-            ("Ahmedabad", "Ahmedabad"),
-            ("Kolkata", "Kolkata"),
-            ("Hyderabad", "Hyderabad"),
-        ],
-    )
+        "Location", choices=LOCATION_FILTER_CHOICES)
     price_filter = SelectField(
-        "Price Range",
-        choices=[
-            ("", "All Prices"),
-            ("0-100", "₹0 - ₹100"),
-            ("100-300", "₹100 - ₹300"),
-            ("300-500", "₹300 - ₹500"),
-            ("500+", "₹500+"),
-        ],
-    )
+        "Price Range", choices=PRICE_FILTER_CHOICES)
     submit = SubmitField("Search")
 
 
@@ -217,16 +198,7 @@ class RestaurantProfileForm(FlaskForm):
                        DataRequired(), Length(max=100)])
     description = TextAreaField('Description', validators=[DataRequired()])
     cuisine_type = SelectField(
-        "Cuisine Type",
-        choices=[
-            ("North Indian", "North Indian"),
-            ("South Indian", "South Indian"),
-            ("Rajasthani/Gujarati", "Rajasthani/Gujarati"),
-            ("Mughlai", "Mughlai"),
-            ("Street Food", "Street Food"),
-        ],
-        validators=[DataRequired()],
-    )
+        "Cuisine Type", choices=CUISINE_CHOICES, validators=[DataRequired()])
     address = TextAreaField('Address', validators=[DataRequired()])
     city = StringField('City', validators=[DataRequired(), Length(max=100)])
     state = StringField('State', validators=[DataRequired(), Length(max=50)])
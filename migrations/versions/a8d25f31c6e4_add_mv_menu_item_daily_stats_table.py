@@ -0,0 +1,35 @@
+"""Add mv_menu_item_daily_stats summary table
+
+Revision ID: a8d25f31c6e4
+Revises: f6a1d9c3e8b2
+Create Date: 2025-10-20 10:12:36.844291
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d25f31c6e4'
+down_revision = 'f6a1d9c3e8b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'mv_menu_item_daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('menu_item_id', sa.Integer(), nullable=False),
+        sa.Column('order_date', sa.Date(), nullable=False),
+        sa.Column('total_qty', sa.Integer(), nullable=False),
+        sa.Column('max_single_qty', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['menu_item_id'], ['menu_items.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('menu_item_id', 'order_date',
+                            name='uq_mv_menu_item_daily_stats_bucket')
+    )
+
+
+def downgrade():
+    op.drop_table('mv_menu_item_daily_stats')
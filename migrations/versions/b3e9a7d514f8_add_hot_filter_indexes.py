@@ -0,0 +1,44 @@
+"""Add indexes for the hot filter shapes in the views
+
+Revision ID: b3e9a7d514f8
+Revises: a8d25f31c6e4
+Create Date: 2025-10-21 15:47:02.310575
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e9a7d514f8'
+down_revision = 'a8d25f31c6e4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Date-range scans over all restaurants (today's menu stats) and
+    # the prefetch join shape over order_items
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'])
+    op.create_index('ix_order_items_menu_item_order', 'order_items',
+                    ['menu_item_id', 'order_id'])
+    # Boolean/enum filters; MySQL has no partial indexes, so the flag
+    # leads a composite instead
+    op.create_index('ix_restaurants_active_cuisine', 'restaurants',
+                    ['is_active', 'cuisine_type'])
+    op.create_index('ix_orders_status', 'orders', ['status'])
+    op.create_index('ix_notifications_user_read_created',
+                    'in_app_notifications',
+                    ['user_id', 'read', 'created_at'])
+    op.create_index('ix_promotions_active_valid', 'promotions',
+                    ['is_active', 'valid_from', 'valid_until'])
+
+
+def downgrade():
+    op.drop_index('ix_promotions_active_valid', table_name='promotions')
+    op.drop_index('ix_notifications_user_read_created',
+                  table_name='in_app_notifications')
+    op.drop_index('ix_orders_status', table_name='orders')
+    op.drop_index('ix_restaurants_active_cuisine', table_name='restaurants')
+    op.drop_index('ix_order_items_menu_item_order', table_name='order_items')
+    op.drop_index('ix_orders_created_at', table_name='orders')
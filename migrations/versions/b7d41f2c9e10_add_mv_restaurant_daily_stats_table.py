@@ -0,0 +1,37 @@
+"""Add mv_restaurant_daily_stats summary table
+
+Revision ID: b7d41f2c9e10
+Revises: a3c2588a39b4
+Create Date: 2025-10-02 18:24:11.908344
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d41f2c9e10'
+down_revision = 'a3c2588a39b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'mv_restaurant_daily_stats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('hour', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('revenue', sa.Numeric(10, 2), nullable=False),
+        sa.Column('order_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('restaurant_id', 'day', 'hour', 'status',
+                            name='uq_mv_restaurant_daily_stats_bucket')
+    )
+
+
+def downgrade():
+    op.drop_table('mv_restaurant_daily_stats')
@@ -0,0 +1,39 @@
+"""Add denormalized restaurant snapshots to orders
+
+Revision ID: c4e89a51d2f7
+Revises: b7d41f2c9e10
+Create Date: 2025-10-06 09:41:37.223810
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e89a51d2f7'
+down_revision = 'b7d41f2c9e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('cuisine_type_snapshot', sa.String(length=50), nullable=True))
+        batch_op.add_column(
+            sa.Column('restaurant_city_snapshot', sa.String(length=100), nullable=True))
+
+    # Back-fill existing orders from their restaurant
+    op.execute(
+        "UPDATE orders SET "
+        "cuisine_type_snapshot = (SELECT cuisine_type FROM restaurants "
+        "WHERE restaurants.id = orders.restaurant_id), "
+        "restaurant_city_snapshot = (SELECT city FROM restaurants "
+        "WHERE restaurants.id = orders.restaurant_id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('orders', schema=None) as batch_op:
+        batch_op.drop_column('restaurant_city_snapshot')
+        batch_op.drop_column('cuisine_type_snapshot')
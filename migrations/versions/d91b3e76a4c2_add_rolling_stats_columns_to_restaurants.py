@@ -0,0 +1,36 @@
+"""Add rolling 30-day stats columns to restaurants
+
+Revision ID: d91b3e76a4c2
+Revises: c4e89a51d2f7
+Create Date: 2025-10-09 14:02:53.671205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91b3e76a4c2'
+down_revision = 'c4e89a51d2f7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('restaurants', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'orders_30d', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column(
+            'revenue_30d', sa.Numeric(12, 2), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column(
+            'reviews_30d', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column(
+            'avg_rating_30d', sa.Numeric(3, 2), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('restaurants', schema=None) as batch_op:
+        batch_op.drop_column('avg_rating_30d')
+        batch_op.drop_column('reviews_30d')
+        batch_op.drop_column('revenue_30d')
+        batch_op.drop_column('orders_30d')
@@ -0,0 +1,25 @@
+"""Add city index to restaurants
+
+Revision ID: f6a1d9c3e8b2
+Revises: e5f2c804b913
+Create Date: 2025-10-16 09:21:44.507318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a1d9c3e8b2'
+down_revision = 'e5f2c804b913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Lets the city GROUP BY / location filters run as index-only scans
+    op.create_index(op.f('ix_restaurants_city'), 'restaurants', ['city'])
+
+
+def downgrade():
+    op.drop_index(op.f('ix_restaurants_city'), table_name='restaurants')
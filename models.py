@@ -1,7 +1,8 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
-from datetime import datetime, date
-from sqlalchemy import func
+from datetime import datetime, date, timedelta
+from sqlalchemy import func, event, inspect, select, and_, or_, exists
+from sqlalchemy.ext.hybrid import hybrid_property
 
 # Initialize db here to avoid circular imports
 db = SQLAlchemy()
@@ -48,7 +49,8 @@ class Restaurant(db.Model):
     description = db.Column(db.Text)
     cuisine_type = db.Column(db.String(50), nullable=False)
     address = db.Column(db.Text, nullable=False)
-    city = db.Column(db.String(100), nullable=False, default='Downtown')
+    city = db.Column(db.String(100), nullable=False,
+                     default='Downtown', index=True)
     state = db.Column(db.String(50), nullable=False, default='CA')
     zip_code = db.Column(db.String(10), nullable=False, default='90210')
     phone = db.Column(db.String(20))
@@ -59,6 +61,20 @@ class Restaurant(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # Rolling 30-day aggregates, bumped by write-time listeners on
+    # Order/Review and settled nightly (analytics.settle_restaurant_rolling_stats)
+    orders_30d = db.Column(db.Integer, nullable=False, default=0)
+    revenue_30d = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    reviews_30d = db.Column(db.Integer, nullable=False, default=0)
+    avg_rating_30d = db.Column(db.Numeric(3, 2), nullable=False, default=0)
+
+    # Active-restaurant listings always filter is_active and usually
+    # narrow by cuisine; MySQL has no partial indexes, so a composite
+    # with the flag leading covers both shapes
+    __table_args__ = (
+        db.Index('ix_restaurants_active_cuisine',
+                 'is_active', 'cuisine_type'),
+    )
 
     # Relationships
     menu_items = db.relationship(
@@ -100,31 +116,141 @@ class MenuItem(db.Model):
     def __repr__(self):
         return f'<MenuItem {self.name} ({self.diet_type})>'
 
+    @classmethod
+    def prefetch_today_stats(cls, items):
+        """Load today's live order stats for many items in one query
+
+        One grouped aggregation over order_items covers the whole list,
+        stashed per instance so the daily properties below read memory
+        instead of issuing a lookup each. The half-open created_at range
+        keeps the predicate sargable (func.date() on the column would
+        bypass its index), and the numbers are live rather than
+        as-of-last-refresh like the summary table.
+        """
+        items = [item for item in items if item.id is not None]
+        if not items:
+            return items
+        day_start = datetime.combine(date.today(), datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        rows = db.session.query(
+            OrderItem.menu_item_id,
+            func.sum(OrderItem.quantity),
+            func.max(OrderItem.quantity)
+        ).join(Order, Order.id == OrderItem.order_id).filter(
+            Order.created_at >= day_start,
+            Order.created_at < day_end,
+            OrderItem.menu_item_id.in_([item.id for item in items])
+        ).group_by(OrderItem.menu_item_id).all()
+        stats = {item_id: (total or 0, largest or 0)
+                 for item_id, total, largest in rows}
+        for item in items:
+            item._today_total, item._today_max = stats.get(item.id, (0, 0))
+        return items
+
+    def _today_stats(self):
+        """Today's (total_qty, max_single_qty) for this item
+
+        Prefetched values from prefetch_today_stats win when present;
+        otherwise one indexed point read against mv_menu_item_daily_stats
+        replaces the two per-item aggregations over order_items that
+        every render of these properties used to run, and the result is
+        memoized on the instance so reading several of the properties
+        below costs one round trip total. A missing row means no orders
+        recorded for today (or the summary has not covered them yet).
+        """
+        total = getattr(self, '_today_total', None)
+        if total is not None:
+            return total, self._today_max
+        row = db.session.query(
+            MenuItemDailyStat.total_qty,
+            MenuItemDailyStat.max_single_qty
+        ).filter(
+            MenuItemDailyStat.menu_item_id == self.id,
+            MenuItemDailyStat.order_date == date.today()
+        ).one_or_none()
+        self._today_total, self._today_max = row if row else (0, 0)
+        return self._today_total, self._today_max
+
     @property
     def order_quantity_today(self):
         """Total quantity of this item ordered today (sum across all orders)"""
-        today = date.today()
-        return db.session.query(
-            func.sum(
-                OrderItem.quantity)).join(Order).filter(
-            OrderItem.menu_item_id == self.id,
-            func.date(
-                Order.created_at) == today).scalar() or 0
+        return self._today_stats()[0]
 
     @property
     def has_large_single_order_today(self):
         """Check if this item has any single order with quantity > 10 today"""
-        today = date.today()
-        return db.session.query(OrderItem).join(Order).filter(
-            OrderItem.menu_item_id == self.id,
-            func.date(Order.created_at) == today,
-            OrderItem.quantity > 10
-        ).first() is not None
+        return self._today_stats()[1] > 10
 
-    @property
+    @hybrid_property
     def is_mostly_ordered(self):
         """Item is 'Mostly Ordered' if >10 quantity overall today or any single order >10 today"""
-        return self.order_quantity_today > 10 or self.has_large_single_order_today
+        total_qty, max_single_qty = self._today_stats()
+        return total_qty > 10 or max_single_qty > 10
+
+    @is_mostly_ordered.expression
+    def is_mostly_ordered(cls):
+        # Set-based form over the daily summary table, so e.g.
+        # MenuItem.query.filter(MenuItem.is_mostly_ordered) pushes the
+        # predicate into a WHERE clause instead of loading every row
+        # and evaluating the property in Python
+        return exists().where(and_(
+            MenuItemDailyStat.menu_item_id == cls.id,
+            MenuItemDailyStat.order_date == date.today(),
+            or_(MenuItemDailyStat.total_qty > 10,
+                MenuItemDailyStat.max_single_qty > 10)))
+
+
+class RestaurantDailyStat(db.Model):
+    """Pre-aggregated per-restaurant order stats (materialized-view stand-in)
+
+    MySQL has no materialized views, so this summary table is rebuilt
+    atomically by analytics.refresh_restaurant_daily_stats() and serves the
+    dashboard aggregation reads instead of re-scanning the orders table.
+    """
+    __tablename__ = 'mv_restaurant_daily_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    restaurant_id = db.Column(db.Integer, db.ForeignKey(
+        'restaurants.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    hour = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    revenue = db.Column(db.Numeric(10, 2), nullable=False, default=0)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('restaurant_id', 'day', 'hour', 'status',
+                            name='uq_mv_restaurant_daily_stats_bucket'),
+    )
+
+    def __repr__(self):
+        return f'<RestaurantDailyStat {self.restaurant_id} {self.day}>'
+
+
+class MenuItemDailyStat(db.Model):
+    """Per-item daily order quantities (materialized-view stand-in)
+
+    Backs MenuItem.order_quantity_today and friends the same way
+    RestaurantDailyStat backs the dashboard: rebuilt atomically by
+    analytics.refresh_menu_item_daily_stats() so menu renders read one
+    summary row per item instead of aggregating order_items per render.
+    """
+    __tablename__ = 'mv_menu_item_daily_stats'
+
+    id = db.Column(db.Integer, primary_key=True)
+    menu_item_id = db.Column(db.Integer, db.ForeignKey(
+        'menu_items.id'), nullable=False)
+    order_date = db.Column(db.Date, nullable=False)
+    total_qty = db.Column(db.Integer, nullable=False, default=0)
+    max_single_qty = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('menu_item_id', 'order_date',
+                            name='uq_mv_menu_item_daily_stats_bucket'),
+    )
+
+    def __repr__(self):
+        return f'<MenuItemDailyStat {self.menu_item_id} {self.order_date}>'
 
 
 class Order(db.Model):
@@ -144,6 +270,10 @@ class Order(db.Model):
         default='pending')
     total_amount = db.Column(db.Numeric(10, 2), nullable=False)
     notes = db.Column(db.Text)
+    # Denormalized from Restaurant at insert time so analytics group-bys
+    # (favorite cuisines/cities) can skip the join to restaurants
+    cuisine_type_snapshot = db.Column(db.String(50))
+    restaurant_city_snapshot = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -152,6 +282,18 @@ class Order(db.Model):
     restaurant_id = db.Column(db.Integer, db.ForeignKey(
         'restaurants.id'), nullable=False)
 
+    # Composite index matching the analytics filter shape
+    # (restaurant_id + created_at range, optionally grouped by status),
+    # plus a plain created_at index for date-range scans that are not
+    # anchored to one restaurant (today's stats across all menus)
+    __table_args__ = (
+        db.Index('ix_orders_rid_created_status',
+                 'restaurant_id', 'created_at', 'status'),
+        db.Index('ix_orders_created_at', 'created_at'),
+        # Admin views filter open orders across all restaurants
+        db.Index('ix_orders_status', 'status'),
+    )
+
     # Relationships
     order_items = db.relationship(
         'OrderItem',
@@ -163,6 +305,44 @@ class Order(db.Model):
         return f'<Order {self.order_number}>'
 
 
+@event.listens_for(Order, 'before_insert')
+def _snapshot_restaurant_onto_order(mapper, connection, order):
+    """Copy the denormalized restaurant fields onto a new order row"""
+    if order.cuisine_type_snapshot is None or order.restaurant_city_snapshot is None:
+        row = connection.execute(
+            select(Restaurant.cuisine_type, Restaurant.city)
+            .where(Restaurant.id == order.restaurant_id)
+        ).first()
+        if row is not None:
+            order.cuisine_type_snapshot = row[0]
+            order.restaurant_city_snapshot = row[1]
+
+
+@event.listens_for(Order, 'after_insert')
+def _bump_restaurant_order_stats(mapper, connection, order):
+    """Maintain the rolling 30-day order aggregates at write time"""
+    connection.execute(
+        Restaurant.__table__.update()
+        .where(Restaurant.id == order.restaurant_id)
+        .values(orders_30d=Restaurant.orders_30d + 1,
+                revenue_30d=Restaurant.revenue_30d + order.total_amount)
+    )
+
+
+@event.listens_for(Restaurant, 'after_update')
+def _sync_order_snapshots(mapper, connection, restaurant):
+    """Keep order snapshots in sync when a restaurant is renamed/moved"""
+    state = inspect(restaurant)
+    if (state.attrs.cuisine_type.history.has_changes()
+            or state.attrs.city.history.has_changes()):
+        connection.execute(
+            Order.__table__.update()
+            .where(Order.restaurant_id == restaurant.id)
+            .values(cuisine_type_snapshot=restaurant.cuisine_type,
+                    restaurant_city_snapshot=restaurant.city)
+        )
+
+
 class OrderItem(db.Model):
     """Order item model"""
     __tablename__ = 'order_items'
@@ -176,6 +356,13 @@ class OrderItem(db.Model):
     menu_item_id = db.Column(db.Integer, db.ForeignKey(
         'menu_items.id'), nullable=False)
 
+    # Covers the menu_item_id IN (...) + join-to-orders shape of
+    # MenuItem.prefetch_today_stats and the daily summary rebuild
+    __table_args__ = (
+        db.Index('ix_order_items_menu_item_order',
+                 'menu_item_id', 'order_id'),
+    )
+
     def __repr__(self):
         return f'<OrderItem {self.quantity}x {self.menu_item.name}>'
 
@@ -216,6 +403,11 @@ class Review(db.Model):
     menu_item_id = db.Column(db.Integer, db.ForeignKey(
         'menu_items.id'), nullable=True)
 
+    # Composite index matching the analytics filter shape
+    __table_args__ = (
+        db.Index('ix_reviews_rid_created', 'restaurant_id', 'created_at'),
+    )
+
     # Relationships
     menu_item = db.relationship('MenuItem', backref='reviews')
 
@@ -223,6 +415,22 @@ class Review(db.Model):
         return f'<Review {self.rating} stars by {self.user.username}>'
 
 
+@event.listens_for(Review, 'after_insert')
+def _bump_restaurant_review_stats(mapper, connection, review):
+    """Maintain the rolling 30-day review aggregates at write time"""
+    cutoff = datetime.utcnow() - timedelta(days=30)
+    avg_rating = select(func.avg(Review.rating)).where(
+        Review.restaurant_id == review.restaurant_id,
+        Review.created_at >= cutoff
+    ).scalar_subquery()
+    connection.execute(
+        Restaurant.__table__.update()
+        .where(Restaurant.id == review.restaurant_id)
+        .values(reviews_30d=Restaurant.reviews_30d + 1,
+                avg_rating_30d=func.coalesce(avg_rating, 0))
+    )
+
+
 class Feedback(db.Model):
     """Feedback model for customer experience"""
     __tablename__ = 'feedbacks'
@@ -263,6 +471,12 @@ class InAppNotification(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     expires_at = db.Column(db.DateTime)
 
+    # The unread-badge query: one user's unread rows, newest first
+    __table_args__ = (
+        db.Index('ix_notifications_user_read_created',
+                 'user_id', 'read', 'created_at'),
+    )
+
     # Relationships
     user = db.relationship('User', backref='notifications')
 
@@ -292,13 +506,20 @@ class Promotion(db.Model):
     created_by = db.Column(
         db.Integer, db.ForeignKey('users.id'), nullable=False)
 
+    # Matches the is_valid expression: flag first, then the validity
+    # window columns it range-scans
+    __table_args__ = (
+        db.Index('ix_promotions_active_valid',
+                 'is_active', 'valid_from', 'valid_until'),
+    )
+
     # Relationships
     creator = db.relationship('User', backref='created_promotions')
 
     def __repr__(self):
         return f'<Promotion {self.title}>'
 
-    @property
+    @hybrid_property
     def is_valid(self):
         """Check if promotion is currently valid"""
         now = datetime.utcnow()
@@ -306,6 +527,18 @@ class Promotion(db.Model):
                 self.valid_from <= now <= self.valid_until and
                 (self.usage_limit is None or self.usage_count < self.usage_limit))
 
+    @is_valid.expression
+    def is_valid(cls):
+        # now is bound when the query is built, which keeps the
+        # comparisons plain column-vs-literal (sargable) and portable
+        # across backends, unlike func.now()
+        now = datetime.utcnow()
+        return and_(cls.is_active.is_(True),
+                    cls.valid_from <= now,
+                    cls.valid_until >= now,
+                    or_(cls.usage_limit.is_(None),
+                        cls.usage_count < cls.usage_limit))
+
 
 class UserPreference(db.Model):
     """User preferences model"""
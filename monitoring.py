@@ -2,14 +2,18 @@
 Performance monitoring and metrics collection for JustEat application
 """
 
+import re
+import sys
 import time
 import psutil
+import hashlib
 import logging
 from datetime import datetime, timedelta
 from flask import request, g, current_app
 from functools import wraps
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict, namedtuple
 import threading
+import queue
 
 logger = logging.getLogger(__name__)
 
@@ -17,144 +21,266 @@ logger = logging.getLogger(__name__)
 class PerformanceMonitor:
     """Performance monitoring system"""
 
+    # Per-minute aggregate buckets retained for metrics windows
+    BUCKET_MINUTES = 60
+    # Seconds a system metrics snapshot stays fresh
+    SYSTEM_SNAPSHOT_TTL = 5
+
     def __init__(self):
         self.metrics = defaultdict(list)
-        self.request_times = deque(maxlen=1000)
-        self.error_counts = defaultdict(int)
-        self.active_connections = 0
-        self.lock = threading.Lock()
+        # Request workers push raw samples onto a SimpleQueue — its
+        # put/get are C-level and thread-safe with no Python lock — and
+        # a single aggregator thread folds them into the minute
+        # buckets. Workers never contend with each other or with the
+        # admin metrics endpoint; only the aggregator and readers share
+        # the bucket lock.
+        self._sample_queue = queue.SimpleQueue()
+        self._buckets = deque(maxlen=self.BUCKET_MINUTES)
+        self._bucket_lock = threading.Lock()
+        aggregator = threading.Thread(
+            target=self._aggregator_loop, daemon=True)
+        aggregator.start()
+        # Per-key int increments are GIL-atomic in CPython, so these
+        # counters are updated without locking. Nested by endpoint then
+        # error type so recording never builds a concatenated key string
+        self.error_counts = defaultdict(lambda: defaultdict(int))
+        # In-flight request count guarded by its own tiny lock: the
+        # bare += / -= pair was a read-modify-write race that lost
+        # updates under concurrent workers, which the old max(0, ...)
+        # clamp papered over
+        self._active_connections = 0
+        self._conn_lock = threading.Lock()
+        # System snapshot kept warm by a background sampler so
+        # get_system_metrics never blocks the caller on
+        # psutil.cpu_percent(interval=1)
+        self._sys_cache = None
+        self._sys_cache_ts = 0.0
+        sampler = threading.Thread(
+            target=self._system_sampler_loop, daemon=True)
+        sampler.start()
+
+    @staticmethod
+    def _new_bucket(minute):
+        return {'minute': minute, 'count': 0, 'total': 0.0,
+                'max': 0.0, 'min': float('inf'), 'endpoints': {}}
 
     def record_request_time(self, endpoint, method, duration):
         """Record request duration"""
-        with self.lock:
-            self.request_times.append({
-                'endpoint': endpoint,
-                'method': method,
-                'duration': duration,
-                'timestamp': datetime.utcnow()
-            })
+        # Interning collapses the per-request endpoint strings to one
+        # shared object, so the aggregator's dict lookups compare by
+        # identity. The put itself is the whole cost on the request
+        # path; bucket folding happens on the aggregator thread.
+        self._sample_queue.put_nowait(
+            (sys.intern(endpoint), duration, int(time.time() // 60)))
+
+    def _aggregator_loop(self):
+        """Drain the sample queue into the minute buckets"""
+        while True:
+            endpoint, duration, minute = self._sample_queue.get()
+            with self._bucket_lock:
+                bucket = self._buckets[-1] if self._buckets else None
+                # A sample queued just before a rotation lands in the
+                # tail bucket rather than reopening a closed minute
+                if bucket is None or minute > bucket['minute']:
+                    bucket = self._new_bucket(minute)
+                    self._buckets.append(bucket)
+
+                bucket['count'] += 1
+                bucket['total'] += duration
+                if duration > bucket['max']:
+                    bucket['max'] = duration
+                if duration < bucket['min']:
+                    bucket['min'] = duration
+
+                stats = bucket['endpoints'].get(endpoint)
+                if stats is None:
+                    stats = bucket['endpoints'][endpoint] = {
+                        'count': 0, 'total': 0.0, 'max': 0.0,
+                        'min': float('inf')}
+                stats['count'] += 1
+                stats['total'] += duration
+                if duration > stats['max']:
+                    stats['max'] = duration
+                if duration < stats['min']:
+                    stats['min'] = duration
 
     def record_error(self, endpoint, error_type):
         """Record error occurrence"""
-        with self.lock:
-            self.error_counts[f"{endpoint}_{error_type}"] += 1
+        self.error_counts[sys.intern(endpoint)][sys.intern(error_type)] += 1
+
+    @property
+    def active_connections(self):
+        return self._active_connections
+
+    def connection_opened(self):
+        """Count a request entering the app"""
+        with self._conn_lock:
+            self._active_connections += 1
+
+    def connection_closed(self):
+        """Count a request leaving the app"""
+        with self._conn_lock:
+            self._active_connections -= 1
+
+    def _system_sampler_loop(self):
+        """Background loop keeping the system snapshot warm"""
+        while True:
+            try:
+                # Blocking here is fine — the sampler thread pays the
+                # one-second cpu_percent window, not the caller
+                self._sys_cache = self._read_system_snapshot(interval=1)
+                self._sys_cache_ts = time.monotonic()
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {str(e)}")
+            time.sleep(self.SYSTEM_SNAPSHOT_TTL)
+
+    def _read_system_snapshot(self, interval=None):
+        """Read raw system metrics from psutil"""
+        # CPU usage; interval=None returns the delta since the last
+        # call without blocking
+        cpu_percent = psutil.cpu_percent(interval=interval)
+
+        # Memory usage
+        memory = psutil.virtual_memory()
+        memory_percent = memory.percent
+        memory_used = memory.used / (1024**3)  # GB
+        memory_total = memory.total / (1024**3)  # GB
+
+        # Disk usage
+        disk = psutil.disk_usage('/')
+        disk_percent = (disk.used / disk.total) * 100
+        disk_used = disk.used / (1024**3)  # GB
+        disk_total = disk.total / (1024**3)  # GB
+
+        # Network I/O
+        network = psutil.net_io_counters()
+        bytes_sent = network.bytes_sent / (1024**2)  # MB
+        bytes_recv = network.bytes_recv / (1024**2)  # MB
+
+        return {
+            'cpu_percent': cpu_percent,
+            'memory_percent': memory_percent,
+            'memory_used_gb': round(memory_used, 2),
+            'memory_total_gb': round(memory_total, 2),
+            'disk_percent': round(disk_percent, 2),
+            'disk_used_gb': round(disk_used, 2),
+            'disk_total_gb': round(disk_total, 2),
+            'network_sent_mb': round(bytes_sent, 2),
+            'network_recv_mb': round(bytes_recv, 2)
+        }
 
     def get_system_metrics(self):
         """Get system performance metrics"""
         try:
-            # CPU usage
-            cpu_percent = psutil.cpu_percent(interval=1)
-
-            # Memory usage
-            memory = psutil.virtual_memory()
-            memory_percent = memory.percent
-            memory_used = memory.used / (1024**3)  # GB
-            memory_total = memory.total / (1024**3)  # GB
-
-            # Disk usage
-            disk = psutil.disk_usage('/')
-            disk_percent = (disk.used / disk.total) * 100
-            disk_used = disk.used / (1024**3)  # GB
-            disk_total = disk.total / (1024**3)  # GB
-
-            # Network I/O
-            network = psutil.net_io_counters()
-            bytes_sent = network.bytes_sent / (1024**2)  # MB
-            bytes_recv = network.bytes_recv / (1024**2)  # MB
-
-            return {
-                'cpu_percent': cpu_percent,
-                'memory_percent': memory_percent,
-                'memory_used_gb': round(memory_used, 2),
-                'memory_total_gb': round(memory_total, 2),
-                'disk_percent': round(disk_percent, 2),
-                'disk_used_gb': round(disk_used, 2),
-                'disk_total_gb': round(disk_total, 2),
-                'network_sent_mb': round(bytes_sent, 2),
-                'network_recv_mb': round(bytes_recv, 2),
-                'active_connections': self.active_connections,
-                'timestamp': datetime.utcnow().isoformat()
-            }
+            snapshot = self._sys_cache
+            age = time.monotonic() - self._sys_cache_ts
+            if snapshot is None or age >= self.SYSTEM_SNAPSHOT_TTL:
+                # Cache cold or stale; read inline without blocking
+                snapshot = self._read_system_snapshot()
+                self._sys_cache = snapshot
+                self._sys_cache_ts = time.monotonic()
+
+            metrics = dict(snapshot)
+            metrics['active_connections'] = self.active_connections
+            metrics['timestamp'] = datetime.utcnow().isoformat()
+            return metrics
         except Exception as e:
             logger.error(f"Error getting system metrics: {str(e)}")
             return {}
 
     def get_request_metrics(self, minutes=60):
         """Get request performance metrics"""
-        with self.lock:
-            cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-            recent_requests = [
-                req for req in self.request_times
-                if req['timestamp'] > cutoff_time
-            ]
-
-            if not recent_requests:
-                return {
-                    'total_requests': 0,
-                    'avg_response_time': 0,
-                    'max_response_time': 0,
-                    'min_response_time': 0,
-                    'requests_per_minute': 0
-                }
-
-            durations = [req['duration'] for req in recent_requests]
-
+        cutoff = int(time.time() // 60) - minutes
+        count = 0
+        total = 0.0
+        max_dur = 0.0
+        min_dur = float('inf')
+        with self._bucket_lock:
+            for bucket in self._buckets:
+                if bucket['minute'] <= cutoff:
+                    continue
+                count += bucket['count']
+                total += bucket['total']
+                if bucket['max'] > max_dur:
+                    max_dur = bucket['max']
+                if bucket['min'] < min_dur:
+                    min_dur = bucket['min']
+
+        if count == 0:
             return {
-                'total_requests': len(recent_requests),
-                'avg_response_time': round(sum(durations) / len(durations), 3),
-                'max_response_time': round(max(durations), 3),
-                'min_response_time': round(min(durations), 3),
-                'requests_per_minute': round(len(recent_requests) / minutes, 2)
+                'total_requests': 0,
+                'avg_response_time': 0,
+                'max_response_time': 0,
+                'min_response_time': 0,
+                'requests_per_minute': 0
             }
 
+        return {
+            'total_requests': count,
+            'avg_response_time': round(total / count, 3),
+            'max_response_time': round(max_dur, 3),
+            'min_response_time': round(min_dur, 3),
+            'requests_per_minute': round(count / minutes, 2)
+        }
+
     def get_error_metrics(self):
         """Get error metrics"""
-        with self.lock:
-            return dict(self.error_counts)
+        # Flatten the nested counters back to the endpoint_errortype
+        # keys callers expect
+        return {
+            f"{endpoint}_{error_type}": count
+            for endpoint, by_type in self.error_counts.items()
+            for error_type, count in by_type.items()
+        }
 
     def get_endpoint_metrics(self, minutes=60):
         """Get metrics by endpoint"""
-        with self.lock:
-            cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-            recent_requests = [
-                req for req in self.request_times
-                if req['timestamp'] > cutoff_time
-            ]
-
-            endpoint_stats = defaultdict(lambda: {
-                'count': 0,
-                'total_time': 0,
-                'avg_time': 0,
-                'max_time': 0,
-                'min_time': float('inf')
-            })
-
-            for req in recent_requests:
-                endpoint = req['endpoint']
-                duration = req['duration']
-
-                stats = endpoint_stats[endpoint]
-                stats['count'] += 1
-                stats['total_time'] += duration
-                stats['max_time'] = max(stats['max_time'], duration)
-                stats['min_time'] = min(stats['min_time'], duration)
-
-            # Calculate averages
-            for stats in endpoint_stats.values():
-                if stats['count'] > 0:
-                    stats['avg_time'] = round(
-                        stats['total_time'] / stats['count'], 3)
-                    stats['max_time'] = round(stats['max_time'], 3)
-                    stats['min_time'] = round(stats['min_time'], 3)
-                else:
-                    stats['min_time'] = 0
-
-            return dict(endpoint_stats)
-
-    def get_health_status(self):
-        """Get overall system health status"""
-        system_metrics = self.get_system_metrics()
-        request_metrics = self.get_request_metrics()
+        cutoff = int(time.time() // 60) - minutes
+        # Accumulate into small [count, total, max, min] lists seeded
+        # from the first bucket seen per endpoint, so no inf sentinel
+        # is allocated and no cleanup pass has to patch unused entries
+        folded = {}
+        with self._bucket_lock:
+            for bucket in self._buckets:
+                if bucket['minute'] <= cutoff:
+                    continue
+                for endpoint, agg in bucket['endpoints'].items():
+                    stats = folded.get(endpoint)
+                    if stats is None:
+                        folded[endpoint] = [agg['count'], agg['total'],
+                                            agg['max'], agg['min']]
+                        continue
+                    stats[0] += agg['count']
+                    stats[1] += agg['total']
+                    if agg['max'] > stats[2]:
+                        stats[2] = agg['max']
+                    if agg['min'] < stats[3]:
+                        stats[3] = agg['min']
+
+        # Every seeded entry has count >= 1, so averages need no guard
+        return {
+            endpoint: {
+                'count': count,
+                'total_time': total,
+                'avg_time': round(total / count, 3),
+                'max_time': round(max_time, 3),
+                'min_time': round(min_time, 3)
+            }
+            for endpoint, (count, total, max_time, min_time)
+            in folded.items()
+        }
+
+    def get_health_status(self, system_metrics=None, request_metrics=None):
+        """Get overall system health status
+
+        Callers that already hold the system/request metrics (the
+        comprehensive snapshot) pass them in so they are not computed a
+        second time.
+        """
+        if system_metrics is None:
+            system_metrics = self.get_system_metrics()
+        if request_metrics is None:
+            request_metrics = self.get_request_metrics()
 
         health_status = {
             'status': 'healthy',
@@ -200,11 +326,13 @@ def monitor_performance(f):
     """Decorator to monitor function performance"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        start_time = time.time()
+        # perf_counter_ns: integer read, faster and higher-resolution
+        # than time.time(), immune to wall-clock adjustments
+        start_ns = time.perf_counter_ns()
 
         try:
             result = f(*args, **kwargs)
-            duration = time.time() - start_time
+            duration = (time.perf_counter_ns() - start_ns) / 1e9
 
             # Record successful request
             endpoint = request.endpoint or 'unknown'
@@ -214,8 +342,6 @@ def monitor_performance(f):
             return result
 
         except Exception as e:
-            duration = time.time() - start_time
-
             # Record error
             endpoint = request.endpoint or 'unknown'
             error_type = type(e).__name__
@@ -256,41 +382,77 @@ def track_database_queries(f):
     return decorated_function
 
 
+# Slotted record for retained query samples: a dict per sample costs
+# ~230 bytes of overhead against ~70 for a namedtuple, which matters at
+# thousand-deep deques, and attribute access skips the per-read hash
+QuerySample = namedtuple('QuerySample', ('query', 'duration', 'timestamp'))
+
+
 class DatabaseMonitor:
     """Database performance monitoring"""
 
     def __init__(self):
         self.query_times = deque(maxlen=1000)
-        self.slow_queries = []
+        # Bounded: this was an unbounded list that grew for the life of
+        # the process
+        self.slow_queries = deque(maxlen=200)
         self.query_counts = defaultdict(int)
+        # Samples carry monotonic_ns ints instead of datetimes: no
+        # allocation per sample, integer compares in the cutoff filter,
+        # and immunity to wall-clock adjustments. The offset converts
+        # back to wall time only when a sample is rendered.
+        self._epoch_offset_ns = time.time_ns() - time.monotonic_ns()
+
+    @staticmethod
+    def _fingerprint(sql):
+        """Hash a query down to an 8-byte template fingerprint"""
+        # Strip string and numeric literals so variants of the same
+        # statement collapse to one template
+        template = re.sub(r"'[^']*'|\b\d+\b", '?', sql)
+        return int.from_bytes(
+            hashlib.blake2b(template.encode(), digest_size=8).digest(),
+            'big')
 
     def record_query(self, query, duration):
         """Record database query performance"""
-        self.query_times.append({
-            'query': str(query),
-            'duration': duration,
-            'timestamp': datetime.utcnow()
-        })
+        # Store an int fingerprint instead of the full SQL text: a
+        # thousand retained query blobs is real memory, and int dict
+        # keys hash faster than long strings
+        fingerprint = self._fingerprint(str(query))
+        now_ns = time.monotonic_ns()
+        self.query_times.append(QuerySample(fingerprint, duration, now_ns))
 
-        self.query_counts[query] += 1
+        self.query_counts[fingerprint] += 1
 
-        # Track slow queries
+        # Track slow queries; these keep the full text because they are
+        # the ones someone will want to read
         if duration > 1.0:
-            self.slow_queries.append({
-                'query': str(query),
-                'duration': duration,
-                'timestamp': datetime.utcnow()
-            })
+            self.slow_queries.append(
+                QuerySample(str(query), duration, now_ns))
 
     def get_query_metrics(self, minutes=60):
         """Get database query metrics"""
-        cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-        recent_queries = [
-            q for q in self.query_times
-            if q['timestamp'] > cutoff_time
-        ]
-
-        if not recent_queries:
+        cutoff_ns = time.monotonic_ns() - minutes * 60_000_000_000
+
+        # One pass computes count, sum, max and the slow tally
+        # together; the old version materialized two intermediate lists
+        # and walked the samples four times
+        count = 0
+        total = 0.0
+        max_time = 0.0
+        slow_count = 0
+        for q in self.query_times:
+            if q.timestamp <= cutoff_ns:
+                continue
+            duration = q.duration
+            count += 1
+            total += duration
+            if duration > max_time:
+                max_time = duration
+            if duration > 1.0:
+                slow_count += 1
+
+        if count == 0:
             return {
                 'total_queries': 0,
                 'avg_query_time': 0,
@@ -298,24 +460,28 @@ class DatabaseMonitor:
                 'slow_queries': 0
             }
 
-        durations = [q['duration'] for q in recent_queries]
-        slow_count = len([d for d in durations if d > 1.0])
-
         return {
-            'total_queries': len(recent_queries),
-            'avg_query_time': round(sum(durations) / len(durations), 3),
-            'max_query_time': round(max(durations), 3),
+            'total_queries': count,
+            'avg_query_time': round(total / count, 3),
+            'max_query_time': round(max_time, 3),
             'slow_queries': slow_count,
-            'queries_per_minute': round(len(recent_queries) / minutes, 2)
+            'queries_per_minute': round(count / minutes, 2)
         }
 
     def get_slow_queries(self, limit=10):
         """Get recent slow queries"""
-        return sorted(
+        slowest = sorted(
             self.slow_queries,
-            key=lambda x: x['duration'],
+            key=lambda x: x.duration,
             reverse=True
         )[:limit]
+        # Render wall-clock timestamps only for the handful returned
+        return [{
+            'query': q.query,
+            'duration': q.duration,
+            'timestamp': datetime.fromtimestamp(
+                (q.timestamp + self._epoch_offset_ns) / 1e9)
+        } for q in slowest]
 
 
 # Global database monitor instance
@@ -325,40 +491,57 @@ db_monitor = DatabaseMonitor()
 class CacheMonitor:
     """Cache performance monitoring"""
 
+    # Per-minute hit/miss deltas retained for metrics windows
+    BUCKET_MINUTES = 60
+    # Most distinct cache keys tracked before the coldest is evicted
+    MAX_TRACKED_KEYS = 10000
+
     def __init__(self):
-        self.hit_counts = defaultdict(int)
-        self.miss_counts = defaultdict(int)
-        self.cache_operations = deque(maxlen=1000)
+        # OrderedDicts used as bounded LRU counters: cache keys are
+        # arbitrary (every URL variant mints one), so unbounded per-key
+        # dicts leak memory proportional to traffic
+        self.hit_counts = OrderedDict()
+        self.miss_counts = OrderedDict()
+        # Per-minute counter buckets instead of a deque of per-operation
+        # dicts: recording bumps two ints and reading folds at most
+        # BUCKET_MINUTES buckets, independent of cache traffic
+        self._buckets = deque(maxlen=self.BUCKET_MINUTES)
+
+    def _current_bucket(self):
+        minute = int(time.time() // 60)
+        bucket = self._buckets[-1] if self._buckets else None
+        if bucket is None or bucket['minute'] != minute:
+            bucket = {'minute': minute, 'hits': 0, 'misses': 0}
+            self._buckets.append(bucket)
+        return bucket
+
+    def _bump(self, counts, key):
+        counts[key] = counts.get(key, 0) + 1
+        counts.move_to_end(key)
+        if len(counts) > self.MAX_TRACKED_KEYS:
+            counts.popitem(last=False)
 
     def record_cache_hit(self, key):
         """Record cache hit"""
-        self.hit_counts[key] += 1
-        self.cache_operations.append({
-            'operation': 'hit',
-            'key': key,
-            'timestamp': datetime.utcnow()
-        })
+        self._bump(self.hit_counts, key)
+        self._current_bucket()['hits'] += 1
 
     def record_cache_miss(self, key):
         """Record cache miss"""
-        self.miss_counts[key] += 1
-        self.cache_operations.append({
-            'operation': 'miss',
-            'key': key,
-            'timestamp': datetime.utcnow()
-        })
+        self._bump(self.miss_counts, key)
+        self._current_bucket()['misses'] += 1
 
     def get_cache_metrics(self, minutes=60):
         """Get cache performance metrics"""
-        cutoff_time = datetime.utcnow() - timedelta(minutes=minutes)
-        recent_operations = [
-            op for op in self.cache_operations
-            if op['timestamp'] > cutoff_time
-        ]
-
-        hits = len([op for op in recent_operations if op['operation'] == 'hit'])
-        misses = len(
-            [op for op in recent_operations if op['operation'] == 'miss'])
+        cutoff = int(time.time() // 60) - minutes
+
+        hits = 0
+        misses = 0
+        for bucket in self._buckets:
+            if bucket['minute'] <= cutoff:
+                continue
+            hits += bucket['hits']
+            misses += bucket['misses']
         total = hits + misses
 
         hit_rate = (hits / total * 100) if total > 0 else 0
@@ -376,18 +559,38 @@ class CacheMonitor:
 cache_monitor = CacheMonitor()
 
 
+# Comprehensive snapshot memoized for SNAPSHOT_TTL seconds; reads
+# publish and consume the whole dict by reference, which is atomic
+_snapshot = None
+_snapshot_ts = 0.0
+SNAPSHOT_TTL = 5
+
+
 def get_comprehensive_metrics():
     """Get comprehensive system metrics"""
-    return {
-        'system': performance_monitor.get_system_metrics(),
-        'requests': performance_monitor.get_request_metrics(),
+    global _snapshot, _snapshot_ts
+    if (_snapshot is not None
+            and time.monotonic() - _snapshot_ts < SNAPSHOT_TTL):
+        return _snapshot
+
+    # System and request metrics are computed once and fed to the
+    # health check rather than recomputed inside it
+    system_metrics = performance_monitor.get_system_metrics()
+    request_metrics = performance_monitor.get_request_metrics()
+    snapshot = {
+        'system': system_metrics,
+        'requests': request_metrics,
         'errors': performance_monitor.get_error_metrics(),
         'endpoints': performance_monitor.get_endpoint_metrics(),
         'database': db_monitor.get_query_metrics(),
         'cache': cache_monitor.get_cache_metrics(),
-        'health': performance_monitor.get_health_status(),
+        'health': performance_monitor.get_health_status(
+            system_metrics, request_metrics),
         'timestamp': datetime.utcnow().isoformat()
     }
+    _snapshot = snapshot
+    _snapshot_ts = time.monotonic()
+    return snapshot
 
 
 def log_performance_metrics():
@@ -420,13 +623,13 @@ def init_performance_monitoring(app):
 
     @app.before_request
     def before_request():
-        g.start_time = time.time()
-        performance_monitor.active_connections += 1
+        g.start_time = time.perf_counter_ns()
+        performance_monitor.connection_opened()
 
     @app.after_request
     def after_request(response):
         if hasattr(g, 'start_time'):
-            duration = time.time() - g.start_time
+            duration = (time.perf_counter_ns() - g.start_time) / 1e9
             endpoint = request.endpoint or 'unknown'
             method = request.method
 
@@ -435,8 +638,7 @@ def init_performance_monitoring(app):
             # Add performance headers
             response.headers['X-Response-Time'] = f"{duration:.3f}s"
 
-        performance_monitor.active_connections = max(
-            0, performance_monitor.active_connections - 1)
+        performance_monitor.connection_closed()
         return response
 
     @app.errorhandler(Exception)
@@ -224,6 +224,10 @@ def manage_promotions():
             query = query.filter_by(is_active=True)
         elif status_filter == 'inactive':
             query = query.filter_by(is_active=False)
+        elif status_filter == 'valid':
+            # Hybrid property: the whole validity predicate (window,
+            # usage limit, active flag) runs as a WHERE clause
+            query = query.filter(Promotion.is_valid)
 
         promotions = query.order_by(Promotion.created_at.desc())\
             .paginate(page=page, per_page=20, error_out=False)
@@ -11,6 +11,9 @@ from models import (
     Feedback,
     UserPreference,
 )
+from cache import (list_special_items, list_deal_items,
+                   list_restaurant_choices, get_cities, get_cuisines)
+from constants import PRICE_FILTER_RANGES
 from forms import ReviewForm, FeedbackForm, ProfileForm, SearchForm
 from models import db
 from datetime import datetime, date
@@ -117,27 +120,23 @@ def browse_restaurants():
     if location_search:
         query = query.filter(Restaurant.city.ilike(f"%{location_search}%"))
 
+    # Price filter as an EXISTS semi-join (shared PRICE_FILTER_RANGES
+    # table): one indexed range predicate in SQL replaces the chained
+    # per-item comparisons over every restaurant's menu, and running it
+    # before paginate() keeps the page counts correct
+    if price_filter in PRICE_FILTER_RANGES:
+        low, high = PRICE_FILTER_RANGES[price_filter]
+        items_in_range = MenuItem.query.filter(
+            MenuItem.restaurant_id == Restaurant.id,
+            MenuItem.price >= low if high is None
+            else MenuItem.price.between(low, high)
+        )
+        query = query.filter(items_in_range.exists())
+
     pagination = query.order_by(Restaurant.name.asc()).paginate(
         page=page, per_page=per_page, error_out=False)
     restaurants = pagination.items
 
-    # Price filter
-    if price_filter:
-        filtered_restaurants = []
-        for restaurant in restaurants:
-            if any(
-                (price_filter == "0-200" and 0 <= float(item.price) <= 200) or
-                (price_filter == "201-500" and 201 <= float(item.price) <= 500) or
-                (price_filter == "501-1000" and 501 <= float(item.price) <= 1000) or
-                (price_filter == "1001-1500" and 1001 <= float(item.price) <= 1500) or
-                (price_filter == "1501+" and float(item.price) >= 1501)
-                for item in restaurant.menu_items
-            ):
-                filtered_restaurants.append(restaurant)
-        restaurants = filtered_restaurants
-        pagination.items = restaurants
-        pagination.total = len(restaurants)
-
     # Debug: print restaurant names and image URLs
     for r in restaurants:
         print(f"Restaurant: {r.name}, Image URL: {r.image_url}")
@@ -152,6 +151,10 @@ def browse_restaurants():
         location_filter=location_filter,
         location_search=location_search,
         price_filter=price_filter,
+        # Cached reference lists drive the filter dropdowns, so they
+        # track the actual data instead of a hardcoded set
+        cuisines=get_cuisines(),
+        cities=get_cities(),
     )
 
 
@@ -197,32 +200,11 @@ def view_restaurant(restaurant_id):
         # Get menu items
         menu_items = query.all()
 
-        # Mark "Mostly Ordered" dynamically
-        today = date.today()
+        # Mark "Mostly Ordered" from one grouped query over today's
+        # order items instead of two lookups per menu item
+        MenuItem.prefetch_today_stats(menu_items)
         for item in menu_items:
-            # total quantity ordered today across all orders
-            total_quantity = (
-                db.session.query(func.coalesce(
-                    func.sum(OrderItem.quantity), 0))
-                .join(Order, Order.id == OrderItem.order_id)
-                .filter(OrderItem.menu_item_id == item.id)
-                .filter(func.date(Order.created_at) == today)
-                .scalar()
-            )
-
-            # check if any single order had quantity > 10
-            single_large_order = (
-                db.session.query(OrderItem.id)
-                .join(Order, Order.id == OrderItem.order_id)
-                .filter(OrderItem.menu_item_id == item.id)
-                .filter(func.date(Order.created_at) == today)
-                .filter(OrderItem.quantity > 10)
-                .first()
-            )
-
-            item.mostly_ordered = (total_quantity > 10) or (
-                single_large_order is not None
-            )
+            item.mostly_ordered = item.is_mostly_ordered
 
         # Group menu items by category
         menu_by_category = {}
@@ -664,11 +646,10 @@ def feedback():
     """Submit feedback"""
     form = FeedbackForm()
 
-    # Populate restaurant choices
-    restaurants = Restaurant.query.filter_by(is_active=True).all()
-    form.restaurant.choices = [(0, "General Feedback")] + [
-        (r.id, r.name) for r in restaurants
-    ]
+    # Populate restaurant choices from the cached (id, name) list — no
+    # full-table materialization per feedback-page render
+    form.restaurant.choices = [
+        (0, "General Feedback")] + list_restaurant_choices()
 
     if form.validate_on_submit():
         try:
@@ -747,15 +728,9 @@ def recommendations():
         # Popular + offers
         popular_restaurants = Restaurant.query.filter_by(
             is_active=True).limit(6).all()
-        special_items = (
-            MenuItem.query.filter_by(
-                is_special=True, is_available=True).limit(6).all()
-        )
-        deal_items = (
-            MenuItem.query.filter_by(is_deal_of_day=True, is_available=True)
-            .limit(6)
-            .all()
-        )
+        # Slow-changing featured lists come from the TTL cache
+        special_items = list_special_items(6)
+        deal_items = list_deal_items(6)
 
         return render_template(
             "customer/recommendations.html",
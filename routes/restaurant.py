@@ -765,41 +765,11 @@ def restaurant_detail(restaurant_id):
     restaurant = Restaurant.query.get_or_404(restaurant_id)
     menu_items = restaurant.menu_items.all()
 
-    today = date.today()
-    start_of_day = datetime.combine(today, datetime.min.time())
-    end_of_day = datetime.combine(today, datetime.max.time())
-
+    # Mostly Ordered badge from one grouped query over today's order
+    # items instead of two aggregations per menu item
+    MenuItem.prefetch_today_stats(menu_items)
     for item in menu_items:
-        # Total quantity ordered today
-        total_quantity = (
-            db.session.query(db.func.coalesce(
-                db.func.sum(OrderItem.quantity), 0))
-            .join(Order)
-            .filter(
-                OrderItem.menu_item_id == item.id,
-                Order.restaurant_id == restaurant.id,
-                Order.created_at >= start_of_day,
-                Order.created_at <= end_of_day,
-            )
-            .scalar()
-        )
-
-        # Max quantity in a single order today
-        max_single_order = (
-            db.session.query(db.func.coalesce(
-                db.func.max(OrderItem.quantity), 0))
-            .join(Order)
-            .filter(
-                OrderItem.menu_item_id == item.id,
-                Order.restaurant_id == restaurant.id,
-                Order.created_at >= start_of_day,
-                Order.created_at <= end_of_day,
-            )
-            .scalar()
-        )
-
-        # Mostly ordered condition
-        item.mostly_ordered = (total_quantity > 10) or (max_single_order > 10)
+        item.mostly_ordered = item.is_mostly_ordered
 
     return render_template(
         "restaurant_detail.html",
@@ -815,10 +785,6 @@ def manage_menu_all():
         flash("Access denied.", "danger")
         return redirect(url_for("main.index"))
 
-    today = date.today()
-    start_of_day = datetime.combine(today, datetime.min.time())
-    end_of_day = datetime.combine(today, datetime.max.time())
-
     search_query = request.args.get("q", "").strip()  # <-- get search input
 
     restaurants = Restaurant.query.filter_by(owner_id=current_user.id).all()
@@ -833,6 +799,10 @@ def manage_menu_all():
 
         menu_items = menu_query.all()
 
+        # One grouped query covers the Mostly Ordered badge for this
+        # restaurant's whole menu
+        MenuItem.prefetch_today_stats(menu_items)
+
         # Group menu items by category
         menu_by_category = {}
         for item in menu_items:
@@ -840,34 +810,7 @@ def manage_menu_all():
                 menu_by_category[item.category] = []
             menu_by_category[item.category].append(item)
 
-            # Mostly Ordered logic 
-            total_quantity = (
-                db.session.query(
-                    db.func.coalesce(
-                        db.func.sum(
-                            OrderItem.quantity),
-                        0)) .join(Order) .filter(
-                    OrderItem.menu_item_id == item.id,
-                    Order.restaurant_id == restaurant.id,
-                    Order.created_at >= start_of_day,
-                    Order.created_at <= end_of_day,
-                ) .scalar())
-
-            max_single_order = (
-                db.session.query(
-                    db.func.coalesce(
-                        db.func.max(
-                            OrderItem.quantity),
-                        0)) .join(Order) .filter(
-                    OrderItem.menu_item_id == item.id,
-                    Order.restaurant_id == restaurant.id,
-                    Order.created_at >= start_of_day,
-                    Order.created_at <= end_of_day,
-                ) .scalar())
-
-            item.mostly_ordered = (
-                total_quantity > 10) or (
-                max_single_order > 10)
+            item.mostly_ordered = item.is_mostly_ordered
 
         all_restaurants_menus.append({
             "restaurant": restaurant,